@@ -1,11 +1,14 @@
 import eventlet
 eventlet.monkey_patch()
+from eventlet import tpool
 
 import os
 import json
+import hashlib
 import signal
 import subprocess
 import re
+import socket
 from datetime import datetime
 from functools import wraps
 from pathlib import Path
@@ -13,14 +16,30 @@ import logging
 import time
 import threading
 import configparser
+import fnmatch
 from collections import defaultdict
 
 from app import app
 from flask import (
     Flask, render_template, request, jsonify, Response,
-    send_file, abort, redirect, url_for, session, flash, stream_with_context
+    abort, redirect, url_for, session, flash, stream_with_context
 )
 from flask_socketio import SocketIO, emit
+from werkzeug.http import http_date, quote_etag
+from app.utils.logfiles import (
+    MAX_TAIL_LINES, Segment, parse_since, tail_offset, since_offset,
+    total_length, iter_range, gzip_stream, file_snapshot
+)
+from app.utils.jobs import JobRunner, JobFailed
+from app.utils.actions import ActionLocks, ReloadCoalescer
+from app.utils.gitcheck import RemoteTips
+from app.utils.logrotate import LogRotator, parse_quotas
+from app.utils.logindex import LogIndexer, read_page
+from app.utils.logstream import LogTailer, LogFilter, FrameBatcher, CursorStore
+from supervisor.xmlrpc import Faults
+from supervisor_client import (
+    supervisor, Fault, EVENT_LISTENER_NAME, process_name as rpc_process_name
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -42,62 +61,127 @@ socketio = SocketIO(
 )
 
 SUPERVISOR_LOG_DIR = "/var/log/supervisor"
+LOG_ROTATION_INTERVAL = int(os.getenv("LOG_ROTATION_INTERVAL", 60))
+BOT_LOG_QUOTA = int(os.getenv("BOT_LOG_QUOTA_MB", 100)) * 1024 * 1024
+BOT_LOG_QUOTAS = parse_quotas(os.getenv("BOT_LOG_QUOTAS", ""))
+LOG_ARCHIVE_MAX_BYTES = int(os.getenv("LOG_ARCHIVE_MAX_MB", 2048)) * 1024 * 1024
+LOG_INDEX_DIR = os.getenv("LOG_INDEX_DIR", f"{SUPERVISOR_LOG_DIR}/.index")
+LOG_INDEX_INTERVAL = int(os.getenv("LOG_INDEX_INTERVAL", 30))
+LOG_PAGE_SIZE = 200
+MAX_LOG_PAGE_SIZE = 1000
+LOGSTREAM_KEEPALIVE = 15
+LOG_RATE_CEILING = int(os.getenv("LOG_RATE_CEILING_KB", 0)) * 1024
+LOG_RATES_INTERVAL = 5
+LOGSTREAM_RETRY_MS = 3000
+LOGSTREAM_FLUSH_INTERVAL = float(os.getenv("LOGSTREAM_FLUSH_INTERVAL", 0.25))
+LOGSTREAM_MAX_FRAME_SIZE = int(os.getenv("LOGSTREAM_MAX_FRAME_SIZE", 64 * 1024))
 SUPERVISORD_CONF_DIR = "/etc/supervisor/conf.d"
 STATUS_CHECK_INTERVAL = 2
 MAX_STATUS_CHECK_ATTEMPTS = 10
 TEMP_SUPERVISOR_CONFIGS = {}
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+BULK_PARALLELISM = int(os.getenv("BULK_PARALLELISM", 4))
+MAX_BULK_PARALLELISM = 16
+CONFIG_RELOAD_WINDOW = float(os.getenv("CONFIG_RELOAD_WINDOW", 0.5))
+REMOTE_TIP_INTERVAL = int(os.getenv("REMOTE_TIP_INTERVAL", 300))
+SUPERVISOR_EVENT_SOCKET = os.environ.get("SUPERVISOR_EVENT_SOCKET", "/tmp/botclusters-events.sock")
+_state_changed = threading.Condition()
+
+# Shared status snapshot, refreshed by one sampler greenlet and served to every client
+STATUS_REFRESH_INTERVAL = float(os.environ.get('STATUS_REFRESH_INTERVAL', 5))
+_status_snapshot = {"status": "success", "version": 0, "processes": [], "timestamp": None, "server_time": None}
+_snapshot_lock = threading.Lock()
+_refresh_wakeup = threading.Event()
+
+# Control actions run as background jobs; every transition is pushed as a 'job_update' event
+job_runner = JobRunner(JOB_WORKERS, lambda job: socketio.emit('job_update', job, broadcast=True))
+# One action at a time per bot; config reloads requested within CONFIG_RELOAD_WINDOW share one reloadConfig
+action_locks = ActionLocks()
+config_reloads = ReloadCoalescer(supervisor.update, CONFIG_RELOAD_WINDOW)
+# Remote branch tips of the bot checkouts, so a restart can tell whether there is new code to pull
+remote_tips = RemoteTips(max_age=REMOTE_TIP_INTERVAL * 2)
 
 # Track consecutive failures per process for auto-pause
 FAILURE_COUNTS = defaultdict(int)
 MAX_FAILURES_BEFORE_PAUSE = 5
+FAILED_STATES = ("FATAL", "BACKOFF", "EXITED")
 PAUSED_BY_SYSTEM = set()
 
 # Cronjob restart interval (in hours), 0 = disabled
 CRON_RESTART_INTERVAL = int(os.environ.get('CRON_RESTART_HOURS', 0))
 _cron_thread = None
 
-def parse_supervisor_status(status_line):
+def parse_process_info(info):
     try:
-        parts = status_line.strip().split()
-        if len(parts) >= 2:
-            name = parts[0]
-            status = parts[1]
-            pid_match = re.search(r'pid (\d+)', status_line)
-            uptime_match = re.search(r'uptime ([\d:]+)', status_line)
-            pid = pid_match.group(1) if pid_match else None
-            paused = False
-            
-            if pid and is_process_paused(pid):
-                paused = True
-            
-            return {
-                "name": name,
-                "status": status,
-                "pid": pid_match.group(1) if pid_match else None,
-                "uptime": uptime_match.group(1) if uptime_match else "0:00:00",
-                "paused": paused
-            }
+        pid = str(info["pid"]) if info.get("pid") else None
+        return {
+            "name": rpc_process_name(info),
+            "status": info["statename"],
+            "pid": pid,
+            # Clients derive uptime from the start time, so a running process stays unchanged between samples.
+            "started_at": info["start"] if info["statename"] == "RUNNING" else None,
+            "paused": bool(pid) and is_process_paused(pid)
+        }
     except Exception as e:
-        logger.error(f"Error parsing supervisor status line: {e}")
+        logger.error(f"Error parsing supervisor process info: {e}")
     return None
 
+def parked_process(process_name):
+    """Status entry for a program a dashboard stop unregistered; its config waits in TEMP_SUPERVISOR_CONFIGS."""
+    return {
+        "name": process_name,
+        "status": "STOPPED",
+        "pid": None,
+        "started_at": None,
+        "paused": False,
+        "parked": True
+    }
+
+def format_uptime(started_at, now=None):
+    if not started_at:
+        return "0:00:00"
+    seconds = max(0, int((now or time.time()) - started_at))
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    uptime = f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{days} day{'s' if days != 1 else ''}, {uptime}" if days else uptime
+
+def get_processes():
+    processes = []
+    for info in supervisor.get_all_process_info():
+        if info["group"] == EVENT_LISTENER_NAME:
+            continue
+        parsed = parse_process_info(info)
+        if parsed:
+            processes.append(parsed)
+    return processes
+
+def get_process_pid(process_name):
+    try:
+        info = supervisor.get_process_info(process_name)
+    except (Fault, OSError) as e:
+        logger.error(f"Error fetching process info for {process_name}: {e}")
+        return None
+    return info["pid"] if info and info["pid"] else None
+
 def pause_process(process_name):
-    result = run_supervisor_command("status", process_name)
-    if result["status"] == "success":
-        proc = parse_supervisor_status(result["message"])
-        if proc and proc["pid"]:
-            try:
-                os.kill(int(proc["pid"]), signal.SIGSTOP)
-                return {"status": "success", "message": f"Paused process {process_name}"}
-            except Exception as e:
-                logger.error(f"Error pausing process {process_name}: {e}")
-                return {"status": "error", "message": str(e)}
+    pid = get_process_pid(process_name)
+    if pid:
+        try:
+            os.kill(pid, signal.SIGSTOP)
+            return {"status": "success", "message": f"Paused process {process_name}"}
+        except Exception as e:
+            logger.error(f"Error pausing process {process_name}: {e}")
+            return {"status": "error", "message": str(e)}
     return {"status": "error", "message": "Process not running or PID not found"}
 
 @app.route('/supervisor/pause/<process_name>', methods=['POST'])
 def pause_supervisor_process(process_name):
     logger.info(f"Received pause request for process: {process_name}")
-    result = pause_process(process_name)
+    # Waits for any job on this bot, so the signal reaches the process that job left running
+    with action_locks.hold([process_name], "pause"):
+        result = pause_process(process_name)
     if result["status"] == "success":
         broadcast_status_update()
         return jsonify(result), 200
@@ -107,7 +191,8 @@ def pause_supervisor_process(process_name):
 @app.route('/supervisor/resume/<process_name>', methods=['POST'])
 def resume_supervisor_process(process_name):
     logger.info(f"Received resume request for process: {process_name}")
-    result = resume_process(process_name)
+    with action_locks.hold([process_name], "resume"):
+        result = resume_process(process_name)
     if result["status"] == "success":
         broadcast_status_update()
         return jsonify(result), 200
@@ -125,105 +210,184 @@ def is_process_paused(pid):
     return False
 
 def resume_process(process_name):
-    result = run_supervisor_command("status", process_name)
-    if result["status"] == "success":
-        proc = parse_supervisor_status(result["message"])
-        if proc and proc["pid"]:
-            try:
-                os.kill(int(proc["pid"]), signal.SIGCONT)
-                return {"status": "success", "message": f"Resumed process {process_name}"}
-            except Exception as e:
-                logger.error(f"Error resuming process {process_name}: {e}")
-                return {"status": "error", "message": str(e)}
+    pid = get_process_pid(process_name)
+    if pid:
+        try:
+            os.kill(pid, signal.SIGCONT)
+            return {"status": "success", "message": f"Resumed process {process_name}"}
+        except Exception as e:
+            logger.error(f"Error resuming process {process_name}: {e}")
+            return {"status": "error", "message": str(e)}
     return {"status": "error", "message": "Process not running or PID not found"}
 
-def run_supervisor_command(command, process_name=None, timeout=30):
+def run_supervisor_command(command, process_name=None):
     try:
-        cmd = ["supervisorctl"]
-        if command:
-            cmd.append(command)
-        if process_name:
-            cmd.append(process_name)
-
-        logger.info(f"Executing supervisor command: {' '.join(cmd)}")
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-
-        if result.stdout:
-            logger.info(f"Command output: {result.stdout.strip()}")
-        if result.stderr:
-            logger.error(f"Command error: {result.stderr.strip()}")
-
-        if result.returncode == 0:
-            return {"status": "success", "message": result.stdout.strip()}
+        logger.info(f"Executing supervisor command: {command} {process_name or ''}".strip())
+        if command == "start":
+            supervisor.start_process(process_name)
+        elif command == "stop":
+            supervisor.stop_process(process_name)
+        elif command == "restart" and process_name == "all":
+            supervisor.restart_all()
+        elif command == "restart":
+            supervisor.multicall([
+                ("supervisor.stopProcess", (process_name, True)),
+                ("supervisor.startProcess", (process_name, True)),
+            ])
         else:
-            return {"status": "error", "message": result.stderr.strip()}
+            return {"status": "error", "message": f"Unsupported command: {command}"}
+        return {"status": "success", "message": f"{process_name}: {command} ok"}
 
-    except subprocess.TimeoutExpired:
-        logger.error(f"Command timed out after {timeout} seconds")
-        return {"status": "error", "message": f"Command timed out after {timeout} seconds"}
+    except Fault as e:
+        if command == "start" and e.faultCode == Faults.ALREADY_STARTED:
+            # addProcessGroup already autostarted it after a config reload.
+            return {"status": "success", "message": f"{process_name}: already started"}
+        logger.error(f"Supervisor fault for {command} {process_name}: {e.faultString}")
+        return {"status": "error", "message": e.faultString}
     except Exception as e:
         logger.error(f"Error executing supervisor command: {str(e)}")
         return {"status": "error", "message": str(e)}
 
 def verify_process_status(process_name, expected_status=None):
     try:
-        result = run_supervisor_command("status", process_name)
-        if result["status"] == "success":
+        info = supervisor.get_process_info(process_name)
+        if info:
             if expected_status:
-                return expected_status in result["message"]
-            return result["message"]
+                return expected_status == info["statename"]
+            return info["statename"]
         return None
     except Exception as e:
         logger.error(f"Error verifying process status: {str(e)}")
         return None
         
+def track_failures(parsed):
+    pname = parsed["name"]
+    if parsed["status"] in FAILED_STATES:
+        FAILURE_COUNTS[pname] += 1
+        if FAILURE_COUNTS[pname] >= MAX_FAILURES_BEFORE_PAUSE and pname not in PAUSED_BY_SYSTEM:
+            logger.warning(f"Process {pname} has failed {FAILURE_COUNTS[pname]} times, auto-pausing")
+            PAUSED_BY_SYSTEM.add(pname)
+    elif parsed["status"] == "RUNNING":
+        # Reset failure count on healthy status
+        FAILURE_COUNTS[pname] = 0
+        PAUSED_BY_SYSTEM.discard(pname)
+    parsed["auto_paused"] = pname in PAUSED_BY_SYSTEM
+    return parsed
+
+def attach_log_health(parsed):
+    """Add the error counters parsed from the bot's logs to its status entry."""
+    health = log_tailer.health(parsed["name"])
+    parsed["errors_per_min"] = health["errors_per_min"] if health else 0
+    parsed["tracebacks_per_min"] = health["tracebacks_per_min"] if health else 0
+    parsed["last_exception"] = health["last_exception"] if health else None
+    return parsed
+
+def diff_processes(old_processes, new_processes):
+    old_by_name = {p["name"]: p for p in old_processes}
+    new_by_name = {p["name"]: p for p in new_processes}
+    return {
+        "added": [p for name, p in new_by_name.items() if name not in old_by_name],
+        "changed": [p for name, p in new_by_name.items() if name in old_by_name and old_by_name[name] != p],
+        "removed": [name for name in old_by_name if name not in new_by_name]
+    }
+
+def refresh_status_snapshot():
+    """Sample supervisord once and publish a new snapshot version if anything changed.
+
+    Returns the delta from the previous version, or None when nothing changed.
+    """
+    global _status_snapshot
+    with _snapshot_lock:
+        try:
+            processes = [attach_log_health(track_failures(parsed)) for parsed in get_processes()]
+            # Stopped bots are unregistered from supervisord but must stay visible and startable
+            listed = {p["name"] for p in processes}
+            processes += [
+                attach_log_health(track_failures(parked_process(name)))
+                for name in sorted(TEMP_SUPERVISOR_CONFIGS) if name not in listed
+            ]
+            status, message = "success", None
+        except Exception as e:
+            logger.error(f"Error refreshing status snapshot: {str(e)}")
+            processes = _status_snapshot["processes"]
+            status, message = "error", str(e)
+
+        if processes == _status_snapshot["processes"] and status == _status_snapshot["status"]:
+            return None
+        previous = _status_snapshot
+        snapshot = {
+            "status": status,
+            "version": previous["version"] + 1,
+            "processes": processes,
+            "timestamp": datetime.utcnow().isoformat(),
+            "server_time": time.time()
+        }
+        if message:
+            snapshot["message"] = message
+        _status_snapshot = snapshot
+        delta = diff_processes(previous["processes"], processes)
+        delta.update({
+            "status": status,
+            "base_version": previous["version"],
+            "version": snapshot["version"],
+            "server_time": snapshot["server_time"]
+        })
+        return delta
+
+def get_status_snapshot():
+    return _status_snapshot
+
 def broadcast_status_update():
+    """Force a refresh (e.g. after a control action) and push the changes since the last version."""
     try:
-        with app.app_context():
-            status = run_supervisor_command("status")
-            if status["status"] == "success":
-                processes = []
-                for proc_line in status["message"].splitlines():
-                    parsed = parse_supervisor_status(proc_line)
-                    if parsed:
-                        # Track failures: if FATAL or BACKOFF, increment counter
-                        pname = parsed["name"]
-                        if parsed["status"] in ("FATAL", "BACKOFF", "EXITED"):
-                            FAILURE_COUNTS[pname] += 1
-                            if FAILURE_COUNTS[pname] >= MAX_FAILURES_BEFORE_PAUSE and pname not in PAUSED_BY_SYSTEM:
-                                logger.warning(f"Process {pname} has failed {FAILURE_COUNTS[pname]} times, auto-pausing")
-                                PAUSED_BY_SYSTEM.add(pname)
-                                parsed["auto_paused"] = True
-                            elif pname in PAUSED_BY_SYSTEM:
-                                parsed["auto_paused"] = True
-                            else:
-                                parsed["auto_paused"] = False
-                        else:
-                            # Reset failure count on healthy status
-                            if parsed["status"] == "RUNNING":
-                                FAILURE_COUNTS[pname] = 0
-                                if pname in PAUSED_BY_SYSTEM:
-                                    PAUSED_BY_SYSTEM.discard(pname)
-                            parsed["auto_paused"] = pname in PAUSED_BY_SYSTEM
-                        processes.append(parsed)
-                
-                socketio.emit('status_update', {
-                    "status": "success",
-                    "processes": processes,
-                    "timestamp": datetime.utcnow().isoformat()
-                }, broadcast=True)
-                
-                return True
+        delta = refresh_status_snapshot()
+        if delta:
+            socketio.emit('status_delta', delta, broadcast=True)
+        return True
     except Exception as e:
         logger.error(f"Error broadcasting status update: {str(e)}")
         return False
 
+def _status_sampler_loop():
+    """Single sampler feeding every endpoint and socket client, so load does not scale with open tabs."""
+    while True:
+        broadcast_status_update()
+        _refresh_wakeup.wait(STATUS_REFRESH_INTERVAL)
+        _refresh_wakeup.clear()
+
+def request_status_refresh():
+    """Wake the sampler early; a burst of requests collapses into one refresh."""
+    _refresh_wakeup.set()
+
+def wait_for_process_state(process_name, predicate, timeout):
+    """Block until predicate(status) holds, waking on supervisord state events instead of sleeping blindly.
+
+    Falls back to re-checking every STATUS_CHECK_INTERVAL seconds in case the event listener is not running.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        current_status = verify_process_status(process_name)
+        if predicate(current_status):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        with _state_changed:
+            _state_changed.wait(min(remaining, STATUS_CHECK_INTERVAL))
+
+def process_directory(process_name):
+    """Working directory from the program's supervisord conf, or None."""
+    config_path = Path(SUPERVISORD_CONF_DIR) / f"{process_name.replace(' ', '_')}.conf"
+    if not config_path.exists():
+        return None
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    section = 'program:' + process_name
+    if section not in config:
+        return None
+    directory = config[section].get('directory')
+    return directory if directory and Path(directory).exists() else None
+
 def update_process_code(process_name, config_content=None):
     try:
         if config_content:
@@ -292,21 +456,17 @@ def cluster():
 
 @app.route('/supervisor/status', methods=['GET'])
 def list_supervisor_processes():
-    status = run_supervisor_command("status")
-    if status["status"] == "success":
-        processes = []
-        for line in status["message"].splitlines():
-            process = parse_supervisor_status(line)
-            if process:
-                processes.append(process)
-        return jsonify({"status": "success", "processes": processes}), 200
-    return jsonify(status), 500
+    snapshot = dict(get_status_snapshot())
+    now = time.time()
+    snapshot["processes"] = [dict(p, uptime=format_uptime(p["started_at"], now)) for p in snapshot["processes"]]
+    return jsonify(snapshot), 200 if snapshot["status"] == "success" else 500
 
 @socketio.on('connect')
 def handle_connect():
     logger.info("Client connected")
     emit('connected', {'data': 'Connected'})
-    broadcast_status_update()
+    emit('status_update', get_status_snapshot())
+    emit('log_rates', log_tailer.rates())
 
 @socketio.on('disconnect')
 def handle_disconnect():
@@ -314,51 +474,14 @@ def handle_disconnect():
 
 @socketio.on('request_status')
 def handle_status_request():
-    try:
-        status = run_supervisor_command("status")
-        if status["status"] == "success":
-            processes = []
-            for proc in status["message"].splitlines():
-                parsed_proc = parse_supervisor_status(proc)
-                if parsed_proc:
-                    pname = parsed_proc["name"]
-                    if parsed_proc["status"] in ("FATAL", "BACKOFF", "EXITED"):
-                        FAILURE_COUNTS[pname] += 1
-                        if FAILURE_COUNTS[pname] >= MAX_FAILURES_BEFORE_PAUSE:
-                            PAUSED_BY_SYSTEM.add(pname)
-                        parsed_proc["auto_paused"] = pname in PAUSED_BY_SYSTEM
-                    else:
-                        if parsed_proc["status"] == "RUNNING":
-                            FAILURE_COUNTS[pname] = 0
-                            PAUSED_BY_SYSTEM.discard(pname)
-                        parsed_proc["auto_paused"] = pname in PAUSED_BY_SYSTEM
-                    processes.append(parsed_proc)
-            
-            if not processes:
-                logger.warning("No processes found in supervisor status")
-                
-            emit('status_update', {
-                "status": "success",
-                "processes": processes,
-                "timestamp": datetime.utcnow().isoformat()
-            })
-        else:
-            logger.error(f"Error getting supervisor status: {status['message']}")
-            emit('status_update', {
-                "status": "error",
-                "message": status["message"],
-                "processes": []
-            })
-    except Exception as e:
-        logger.error(f"Error in handle_status_request: {str(e)}")
-        emit('status_update', {
-            "status": "error",
-            "message": str(e),
-            "processes": []
-        })
+    snapshot = get_status_snapshot()
+    if not snapshot["processes"]:
+        logger.warning("No processes found in supervisor status")
+    emit('status_update', snapshot)
 
 @app.route('/supervisor/<action>/<process_name>', methods=['POST'])
 def manage_supervisor_process(action, process_name):
+    """Validate a control request and hand it to the job runner; returns 202 with the job id."""
     logger.info(f"Received {action} request for process: {process_name}")
     
     if action not in ["start", "stop", "restart"]:
@@ -369,121 +492,36 @@ def manage_supervisor_process(action, process_name):
     
     try:
         initial_status = verify_process_status(process_name)
+        if initial_status is None and action == "start" and process_name in TEMP_SUPERVISOR_CONFIGS:
+            initial_status = "STOPPED"  # parked: the start job restores and registers it
         if initial_status is None:
             return jsonify({
                 "status": "error", 
                 "message": f"Process {process_name} not found"
             }), 404
-        
-        config_path = Path(SUPERVISORD_CONF_DIR) / f"{process_name.replace(' ', '_')}.conf"
-        
-        if action == "stop":
-            if "RUNNING" not in initial_status:
-                return jsonify({
-                    "status": "error",
-                    "message": f"Process {process_name} is not running"
-                }), 400
-                
-            result = run_supervisor_command("stop", process_name)
-            expected_status = "STOPPED"
-            
-            if result["status"] == "success":
-                try:
-                    if config_path.exists():
-                        with open(config_path, 'r') as f:
-                            TEMP_SUPERVISOR_CONFIGS[process_name] = f.read()
-                            
-                        config_path.unlink()
-                        logger.info(f"Saved and removed supervisor config for {process_name}")
-                        subprocess.run(["supervisorctl", "reread"], check=True)
-                        subprocess.run(["supervisorctl", "update"], check=True)
-                        
-                except Exception as e:
-                    logger.error(f"Error handling supervisor config for {process_name}: {e}")
-            
-        elif action == "start":
-            try:
-                if process_name in TEMP_SUPERVISOR_CONFIGS:
-                    config_content = TEMP_SUPERVISOR_CONFIGS[process_name]
-                    update_process_code(process_name, config_content)
-                    with open(config_path, 'w') as f:
-                        f.write(config_content)
-                    subprocess.run(["supervisorctl", "reread"], check=True)
-                    subprocess.run(["supervisorctl", "update"], check=True)
-                    del TEMP_SUPERVISOR_CONFIGS[process_name]
-                else:
-                    update_process_code(process_name)
-                
-                result = run_supervisor_command("start", process_name)
-                expected_status = "RUNNING"
-                
-            except Exception as e:
-                logger.error(f"Error restoring supervisor config for {process_name}: {e}")
-                return jsonify({
-                    "status": "error",
-                    "message": f"Error restoring configuration: {str(e)}"
-                }), 500
-            
-        elif action == "restart":
-            try:
-                thoroughly_cleanup(process_name)
-                delete_supervisor_logs(process_name)
-                if config_path.exists():
-                    with open(config_path, 'r') as f:
-                        config_content = f.read()
-                    
-                    result = run_supervisor_command("stop", process_name)
-                    if result["status"] == "success":
-                        config_path.unlink()
-                        subprocess.run(["supervisorctl", "reread"], check=True)
-                        subprocess.run(["supervisorctl", "update"], check=True)
-                        time.sleep(2)
-                        update_process_code(process_name, config_content)
-                        with open(config_path, 'w') as f:
-                            f.write(config_content)
-                        subprocess.run(["supervisorctl", "reread"], check=True)
-                        subprocess.run(["supervisorctl", "update"], check=True)
-                        result = run_supervisor_command("start", process_name)
-                        expected_status = "RUNNING"
-                        
-                else:
-                    return jsonify({
-                        "status": "error",
-                        "message": f"Config file not found for {process_name}"
-                    }), 404
-                    
-            except Exception as e:
-                logger.error(f"Error during restart process for {process_name}: {e}")
-                return jsonify({
-                    "status": "error",
-                    "message": f"Error during restart: {str(e)}"
-                }), 500
-        
-        if result["status"] != "success":
-            return jsonify(result), 500
-        for _ in range(MAX_STATUS_CHECK_ATTEMPTS):
-            time.sleep(STATUS_CHECK_INTERVAL)
-            current_status = verify_process_status(process_name)
-            
-            if action == "stop" and current_status is None:
-                broadcast_status_update()
-                return jsonify({
-                    "status": "success",
-                    "message": f"Successfully stopped {process_name}"
-                }), 200
-            
-            if current_status and expected_status in current_status:
-                broadcast_status_update()
-                return jsonify({
-                    "status": "success",
-                    "message": f"Successfully {action}ed {process_name}"
-                }), 200
-                
+
+        if action == "stop" and "RUNNING" not in initial_status:
+            return jsonify({
+                "status": "error",
+                "message": f"Process {process_name} is not running"
+            }), 400
+
+        if action == "restart" and not (Path(SUPERVISORD_CONF_DIR) / f"{process_name.replace(' ', '_')}.conf").exists():
+            return jsonify({
+                "status": "error",
+                "message": f"Config file not found for {process_name}"
+            }), 404
+
+        # A restart only cleans up and pulls when the code moved, unless ?full=1 forces it
+        full = request.args.get("full", "").lower() in ("1", "true", "yes")
+        job = job_runner.submit(action, process_name, run_locked, [process_name],
+                                run_process_action, action, process_name, full)
         return jsonify({
-            "status": "error",
-            "message": f"Process did not reach {expected_status} state after {action}"
-        }), 500
-            
+            "status": "accepted",
+            "job_id": job.id,
+            "message": f"{action.capitalize()} of {process_name} queued"
+        }), 202
+
     except Exception as e:
         logger.error(f"Error managing process {process_name}: {str(e)}")
         return jsonify({
@@ -491,48 +529,440 @@ def manage_supervisor_process(action, process_name):
             "message": f"Error managing process: {str(e)}"
         }), 500
 
+def restart_can_skip_update(job, process_name, full):
+    """(current, commit): current when the checkout is known to be at its remote tip."""
+    directory = None if full else process_directory(process_name)
+    if directory is None:
+        return False, None
+    job_runner.progress(job, "Checking for new commits")
+    return remote_tips.is_current(directory)
+
+def run_locked(job, names, func, *args):
+    """Job body wrapper: run func(job, *args) while holding the action locks of `names`."""
+    def on_wait(busy):
+        job_runner.progress(job, "Waiting for " + ", ".join(f"{a} of {n}" for n, a in busy.items()))
+
+    with action_locks.hold(names, job.action, on_wait):
+        return func(job, *args)
+
+def run_process_action(job, action, process_name, full=False):
+    """Job body for start/stop/restart; raises JobFailed with a user-facing message."""
+    config_path = Path(SUPERVISORD_CONF_DIR) / f"{process_name.replace(' ', '_')}.conf"
+
+    if action == "stop":
+        job_runner.progress(job, "Stopping process")
+        result = run_supervisor_command("stop", process_name)
+        expected_status = "STOPPED"
+
+        if result["status"] == "success":
+            try:
+                if config_path.exists():
+                    with open(config_path, 'r') as f:
+                        TEMP_SUPERVISOR_CONFIGS[process_name] = f.read()
+
+                    config_path.unlink()
+                    logger.info(f"Saved and removed supervisor config for {process_name}")
+                # Unregister just this program; no reread of the other confs
+                supervisor.remove_programs([process_name])
+
+            except Exception as e:
+                logger.error(f"Error handling supervisor config for {process_name}: {e}")
+
+    elif action == "start":
+        try:
+            job_runner.progress(job, "Updating code")
+            if process_name in TEMP_SUPERVISOR_CONFIGS:
+                config_content = TEMP_SUPERVISOR_CONFIGS[process_name]
+                update_process_code(process_name, config_content)
+                with open(config_path, 'w') as f:
+                    f.write(config_content)
+                del TEMP_SUPERVISOR_CONFIGS[process_name]
+            else:
+                update_process_code(process_name)
+            # addProcessGroup from the parsed config; reloads only if supervisord lost it
+            supervisor.add_programs([process_name], reload=config_reloads.request)
+
+            job_runner.progress(job, "Starting process")
+            result = run_supervisor_command("start", process_name)
+            expected_status = "RUNNING"
+
+        except Exception as e:
+            logger.error(f"Error restoring supervisor config for {process_name}: {e}")
+            raise JobFailed(f"Error restoring configuration: {str(e)}")
+
+    elif action == "restart":
+        try:
+            if not config_path.exists():
+                raise JobFailed(f"Config file not found for {process_name}")
+
+            current, commit = restart_can_skip_update(job, process_name, full)
+            job.result = {"path": "fast" if current else "full", "commit": commit}
+            if current:
+                # Nothing to pull: keep the bytecode and logs and skip pkill, purge and git pull
+                job_runner.progress(job, f"Code unchanged at {commit[:7]}")
+            else:
+                job_runner.progress(job, "Cleaning up")
+                thoroughly_cleanup(process_name)
+                log_rotator.archive(process_name)
+
+            # The program's config is unchanged, so it stays registered: a stop/start is enough
+            job_runner.progress(job, "Stopping process")
+            result = run_supervisor_command("stop", process_name)
+            if result["status"] == "success":
+                if not current:
+                    job_runner.progress(job, "Updating code")
+                    update_process_code(process_name)
+                job_runner.progress(job, "Starting process")
+                result = run_supervisor_command("start", process_name)
+                expected_status = "RUNNING"
+
+        except JobFailed:
+            raise
+        except Exception as e:
+            logger.error(f"Error during restart process for {process_name}: {e}")
+            raise JobFailed(f"Error during restart: {str(e)}")
+
+    if result["status"] != "success":
+        raise JobFailed(result.get("message") or f"Failed to {action} {process_name}")
+
+    def reached(current_status):
+        if action == "stop" and current_status is None:
+            return True
+        return bool(current_status) and expected_status in current_status
+
+    job_runner.progress(job, f"Waiting for {expected_status}")
+    if wait_for_process_state(process_name, reached, MAX_STATUS_CHECK_ATTEMPTS * STATUS_CHECK_INTERVAL):
+        broadcast_status_update()
+        return f"Successfully stopped {process_name}" if action == "stop" else f"Successfully {action}ed {process_name}"
+
+    raise JobFailed(f"Process did not reach {expected_status} state after {action}")
+
+def resolve_bulk_targets(data, action):
+    """Turn a bulk request's names or selector into known process names; raises ValueError.
+
+    Parked programs (stopped and unregistered) only count as known for a start.
+    """
+    parked = set(TEMP_SUPERVISOR_CONFIGS)
+    known = [p["name"] for p in get_status_snapshot()["processes"] if p["name"] not in parked]
+    if action == "start":
+        known += sorted(parked)
+    if data.get("names"):
+        names = list(dict.fromkeys(data["names"]))
+        invalid = [n for n in names if not isinstance(n, str) or not re.match(r'^[a-zA-Z0-9_\- ]+$', n)]
+        if invalid:
+            raise ValueError(f"Invalid process names: {', '.join(map(str, invalid))}")
+        unknown = [n for n in names if n not in known]
+        if unknown:
+            raise ValueError(f"Unknown processes: {', '.join(unknown)}")
+        return names
+
+    selector = data.get("selector")
+    if selector == "all":
+        return known
+    if selector == "failed":
+        return [
+            p["name"] for p in get_status_snapshot()["processes"]
+            if p["status"] in FAILED_STATES or p.get("auto_paused")
+        ]
+    if isinstance(selector, str) and selector.startswith("pattern:"):
+        return fnmatch.filter(known, selector[len("pattern:"):])
+    raise ValueError("Provide names or a selector: all, failed or pattern:<glob>")
+
+@app.route('/supervisor/bulk', methods=['POST'])
+@login_required
+def bulk_supervisor_action():
+    """Apply start/stop/restart to many processes as one job.
+
+    Body: {"action": "restart", "names": [...]} or {"action": ..., "selector": "all" |
+    "failed" | "pattern:<glob>"}, with optional "parallelism" and, for restarts, "full"
+    to clean up and pull even bots whose code is unchanged.
+    """
+    data = request.get_json(silent=True) or {}
+    action = data.get("action")
+    if action not in ["start", "stop", "restart"]:
+        return jsonify({"status": "error", "message": "Invalid action"}), 400
+    full = bool(data.get("full"))
+    try:
+        names = resolve_bulk_targets(data, action)
+        parallelism = min(max(int(data.get("parallelism", BULK_PARALLELISM)), 1), MAX_BULK_PARALLELISM)
+    except (TypeError, ValueError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    if not names:
+        return jsonify({"status": "error", "message": "No processes matched"}), 400
+
+    job = job_runner.submit(f"bulk_{action}", names, run_locked, names,
+                            run_bulk_action, action, names, parallelism, full)
+    return jsonify({
+        "status": "accepted",
+        "job_id": job.id,
+        "processes": names,
+        "message": f"{action.capitalize()} of {len(names)} processes queued"
+    }), 202
+
+def run_bulk_action(job, action, names, parallelism, full=False):
+    """Job body for bulk actions: per-process work runs `parallelism` at a time, and programs
+    are (un)registered with one process-group multicall for the whole batch."""
+    pool = eventlet.GreenPool(parallelism)
+    results = {name: {"status": "pending"} for name in names}
+    job.result = results
+
+    def guarded(func):
+        def run(name):
+            try:
+                return func(name)
+            except Exception as e:
+                logger.error(f"Bulk {action} failed for {name}: {e}")
+                return {"status": "error", "message": str(e)}
+        return run
+
+    def each(func, targets):
+        for name, outcome in zip(targets, pool.imap(guarded(func), targets)):
+            if outcome and outcome.get("status") != "success":
+                results[name] = {"status": "error", "message": outcome.get("message")}
+        return [name for name in targets if results[name]["status"] != "error"]
+
+    def conf_path(name):
+        return Path(SUPERVISORD_CONF_DIR) / f"{name.replace(' ', '_')}.conf"
+
+    def stop(name):
+        if "RUNNING" not in (verify_process_status(name) or ""):
+            return None
+        return run_supervisor_command("stop", name)
+
+    unchanged = []
+
+    def prepare_restart(name):
+        directory = None if full else process_directory(name)
+        if directory and remote_tips.is_current(directory)[0]:
+            unchanged.append(name)
+            return None
+        thoroughly_cleanup(name)
+        log_rotator.archive(name)
+        update_process_code(name)
+
+    def prepare_start(name):
+        if name in TEMP_SUPERVISOR_CONFIGS:
+            conf_path(name).write_text(TEMP_SUPERVISOR_CONFIGS.pop(name))
+        update_process_code(name)
+
+    if action == "stop":
+        job_runner.progress(job, f"Stopping {len(names)} processes")
+        active = each(stop, names)
+        for name in active:
+            path = conf_path(name)
+            if path.exists():
+                TEMP_SUPERVISOR_CONFIGS[name] = path.read_text()
+                path.unlink()
+        job_runner.progress(job, "Unregistering programs")
+        supervisor.remove_programs(active)
+        expected_status = "STOPPED"
+
+    else:
+        job_runner.progress(job, "Cleaning up and updating code" if action == "restart" else "Updating code")
+        active = each(prepare_restart if action == "restart" else prepare_start, names)
+        if action == "restart":
+            job_runner.progress(job, f"Stopping {len(active)} processes")
+            active = each(stop, active)
+        else:
+            # One multicall of addProcessGroup; at most one reloadConfig for the whole batch
+            job_runner.progress(job, "Registering programs")
+            supervisor.add_programs(active, reload=config_reloads.request)
+        job_runner.progress(job, f"Starting {len(active)} processes")
+        active = each(lambda name: run_supervisor_command("start", name), active)
+        expected_status = "RUNNING"
+
+    def reached(current_status):
+        if action == "stop" and current_status is None:
+            return True
+        return bool(current_status) and expected_status in current_status
+
+    job_runner.progress(job, f"Waiting for {expected_status}")
+    timeout = MAX_STATUS_CHECK_ATTEMPTS * STATUS_CHECK_INTERVAL
+    settled = pool.imap(lambda name: wait_for_process_state(name, reached, timeout), active)
+    for name, ok in zip(active, settled):
+        results[name] = {"status": "success"} if ok else {
+            "status": "error", "message": f"Did not reach {expected_status}"
+        }
+    broadcast_status_update()
+
+    failed = [name for name, outcome in results.items() if outcome["status"] != "success"]
+    summary = f"{action.capitalize()}: {len(names) - len(failed)}/{len(names)} succeeded"
+    if unchanged:
+        summary += f", {len(unchanged)} without code changes"
+    if failed:
+        raise JobFailed(f"{summary}; failed: {', '.join(failed)}")
+    return summary
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+@login_required
+def get_job(job_id):
+    """Status, steps and timing of a control job."""
+    job = job_runner.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": f"Job {job_id} not found"}), 404
+    return jsonify({"status": "success", "job": job.to_dict()})
+
+@app.route('/jobs', methods=['GET'])
+@login_required
+def list_jobs():
+    return jsonify({"status": "success", "jobs": job_runner.recent()})
+
+@app.route('/supervisor/metrics', methods=['GET'])
+@login_required
+def supervisor_metrics():
+    """Per-process action queue depth and lock wait times, plus config reload coalescing."""
+    return jsonify({
+        "status": "success",
+        "actions": action_locks.metrics(),
+        "reloads": config_reloads.metrics(),
+    })
+
 @app.route('/supervisor/log/<process_name>', methods=['GET'])
 def download_supervisor_log(process_name):
+    """Stream a bot's logs without buffering them in memory or on disk.
+
+    stream=out|err selects one file (default: both, with section headers), tail=N keeps
+    the last N lines and since=<epoch|ISO-8601> the lines stamped from then on. HTTP
+    Range is honoured; otherwise the body is gzip-encoded when the client accepts it.
+    The ETag covers each file's inode, size and mtime, so a resume with a stale If-Range
+    gets the whole current body instead of mismatched bytes.
+    """
     try:
         if not re.match(r'^[a-zA-Z0-9_\- ]+$', process_name):
             return jsonify({"status": "error", "message": "Invalid process name"}), 400
-        
-        stdout_log = Path(SUPERVISOR_LOG_DIR) / f"{process_name}_out.log"
-        stderr_log = Path(SUPERVISOR_LOG_DIR) / f"{process_name}_err.log"
-        combined_log = Path(SUPERVISOR_LOG_DIR) / f"{process_name}_combined.log"
-        
-        if stdout_log.exists() or stderr_log.exists():
-            with combined_log.open('w') as outfile:
-                outfile.write(f"=== Combined logs for {process_name} ===\n")
-                outfile.write(f"Generated at: {datetime.utcnow().isoformat()}\n\n")
-                
-                if stdout_log.exists():
-                    outfile.write("=== STDOUT LOG ===\n")
-                    with stdout_log.open('r') as f:
-                        outfile.write(f.read())
-                    outfile.write("\n\n")
-                
-                if stderr_log.exists():
-                    outfile.write("=== STDERR LOG ===\n")
-                    with stderr_log.open('r') as f:
-                        outfile.write(f.read())
-            
-            return send_file(
-                str(combined_log),
-                mimetype='text/plain',
-                as_attachment=True,
-                download_name=f"{process_name}_combined.log"
-            )
-        else:
+
+        stream = request.args.get('stream') or None
+        if stream not in (None, 'out', 'err'):
+            return jsonify({"status": "error", "message": "stream must be 'out' or 'err'"}), 400
+        if any(key in request.args for key in ('from', 'to', 'page')):
+            return _log_page(process_name, stream or 'out')
+        tail = request.args.get('tail', type=int)
+        if tail is not None:
+            tail = min(max(tail, 1), MAX_TAIL_LINES)
+        since = None
+        if request.args.get('since'):
+            try:
+                since = parse_since(request.args['since'])
+            except ValueError:
+                return jsonify({"status": "error", "message": "since must be an epoch or ISO-8601 timestamp"}), 400
+
+        segments = []
+        snapshots = []
+        for name in ([stream] if stream else ['out', 'err']):
+            log_file = Path(SUPERVISOR_LOG_DIR) / f"{process_name}_{name}.log"
+            st = file_snapshot(log_file)
+            if st is None:
+                continue
+            end = st.st_size
+            snapshots.append((name, st.st_ino, st.st_size, st.st_mtime_ns))
+            start = 0
+            # Both scan the file backwards line by line, so run them off the hub
+            if tail is not None:
+                start = tpool.execute(tail_offset, log_file, tail, end)
+            if since is not None:
+                start = max(start, tpool.execute(since_offset, log_file, since, end))
+            if not stream:
+                segments.append(Segment(data=f"=== {'STDOUT' if name == 'out' else 'STDERR'} LOG ===\n".encode()))
+            segments.append(Segment(log_file, start, end))
+            if not stream:
+                segments.append(Segment(data=b"\n\n"))
+
+        if not segments:
             return jsonify({
                 "status": "error",
                 "message": "No log files found for this process"
             }), 404
-            
+
+        last_modified = max(mtime for _, _, _, mtime in snapshots) / 1e9
+        if not stream:
+            # Derived from the files, not the clock, so equal validators mean equal bytes
+            written = datetime.utcfromtimestamp(last_modified).isoformat(timespec='seconds')
+            segments.insert(0, Segment(data=(
+                f"=== Combined logs for {process_name} ===\n"
+                f"Last written at: {written}\n\n"
+            ).encode()))
+
+        etag = hashlib.sha1(json.dumps(
+            [snapshots, stream, tail, request.args.get('since')]).encode()).hexdigest()[:20]
+        length = total_length(segments)
+        headers = {
+            'Accept-Ranges': 'bytes',
+            'Cache-Control': 'no-cache',
+            'Content-Disposition': f'attachment; filename="{process_name}_{stream or "combined"}.log"',
+            'ETag': quote_etag(etag),
+            'Last-Modified': http_date(last_modified),
+        }
+        if_range = request.if_range
+        if if_range.etag is not None:
+            range_valid = if_range.etag == etag
+        elif if_range.date is not None:
+            range_valid = int(if_range.date.timestamp()) == int(last_modified)
+        else:
+            range_valid = True
+        if request.range and range_valid:
+            span = request.range.range_for_length(length)
+            if span is None:
+                return Response(status=416, headers={'Content-Range': f"bytes */{length}"})
+            start, stop = span
+            headers['Content-Range'] = f"bytes {start}-{stop - 1}/{length}"
+            headers['Content-Length'] = str(stop - start)
+            return Response(stream_with_context(iter_range(segments, start, stop)),
+                            status=206, mimetype='text/plain', headers=headers)
+
+        body = iter_range(segments)
+        if request.accept_encodings['gzip']:
+            headers['Content-Encoding'] = 'gzip'
+            headers['Vary'] = 'Accept-Encoding'
+            # A different encoding of the same bytes needs its own strong validator
+            headers['ETag'] = quote_etag(f"{etag}-gz")
+            body = gzip_stream(body)
+        else:
+            headers['Content-Length'] = str(length)
+        return Response(stream_with_context(body), mimetype='text/plain', headers=headers)
+
     except Exception as e:
         logger.error(f"Error accessing log files for {process_name}: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+def _log_page(process_name, stream):
+    """One page of a log window, located through the sparse line/timestamp index."""
+    try:
+        since = parse_since(request.args['from']) if request.args.get('from') else None
+        until = parse_since(request.args['to']) if request.args.get('to') else None
+    except ValueError:
+        return jsonify({"status": "error", "message": "from/to must be epoch or ISO-8601 timestamps"}), 400
+    page = max(request.args.get('page', 0, type=int), 0)
+    page_size = min(max(request.args.get('page_size', LOG_PAGE_SIZE, type=int), 1), MAX_LOG_PAGE_SIZE)
+
+    # Indexing a large log and reading through it are blocking file work; keep them off the hub
+    result = tpool.execute(_read_log_page, f"{process_name}_{stream}.log", page, page_size, since, until)
+    if result is None:
+        return jsonify({
+            "status": "error",
+            "message": "No log files found for this process"
+        }), 404
+    index, first_line, lines, has_more = result
+    return jsonify({
+        "status": "success",
+        "file": index.log_path.name,
+        "page": page,
+        "page_size": page_size,
+        "first_line": first_line + 1,
+        "total_lines": index.lines,
+        "lines": lines,
+        "has_more": has_more
+    })
+
+def _read_log_page(name, page, page_size, since, until):
+    index = log_indexer.get(name)
+    if index is None:
+        return None
+    if since is not None:
+        start_line, start_offset = index.seek_time(since.timestamp())
+    else:
+        start_line, start_offset = 0, 0
+    return (index,) + read_page(index, start_line, start_offset, page, page_size, since, until)
+
 @app.errorhandler(Exception)
 def handle_error(e):
     logger.error(f"Unhandled error: {str(e)}")
@@ -541,29 +971,11 @@ def handle_error(e):
         "message": "An internal server error occurred"
     }), 500
 
-def delete_supervisor_logs(process_name):
-    try:
-        stdout_log = Path(SUPERVISOR_LOG_DIR) / f"{process_name}_out.log"
-        stderr_log = Path(SUPERVISOR_LOG_DIR) / f"{process_name}_err.log"
-        combined_log = Path(SUPERVISOR_LOG_DIR) / f"{process_name}_combined.log"
-        for log_file in [stdout_log, stderr_log, combined_log]:
-            if log_file.exists():
-                log_file.unlink()
-                logger.info(f"Deleted log file: {log_file}")
-    except Exception as e:
-        logger.error(f"Error deleting logs for {process_name}: {e}")
-
 def thoroughly_cleanup(process_name):
+    """Kill stray processes and purge bytecode; callers hold the process's action lock."""
     subprocess.run(f"pkill -f {process_name}", shell=True)
-    directory = None
-    config_path = Path(SUPERVISORD_CONF_DIR) / f"{process_name.replace(' ', '_')}.conf"
-    if config_path.exists():
-        config = configparser.ConfigParser()
-        config.read(config_path)
-        section = 'program:' + process_name
-        if section in config:
-            directory = config[section].get('directory')
-    if directory and Path(directory).exists():
+    directory = process_directory(process_name)
+    if directory:
         for root, dirs, files in os.walk(directory):
             for d in dirs:
                 if d == '__pycache__':
@@ -577,43 +989,130 @@ def thoroughly_cleanup(process_name):
 
 
 # ── Log Stream ──────────────────────────────────────────────────
+log_tailer = LogTailer(SUPERVISOR_LOG_DIR, rate_ceiling=LOG_RATE_CEILING)
+stream_cursors = CursorStore()
+log_indexer = LogIndexer(SUPERVISOR_LOG_DIR, LOG_INDEX_DIR)
+log_rotator = LogRotator(SUPERVISOR_LOG_DIR, BOT_LOG_QUOTA, LOG_ARCHIVE_MAX_BYTES, BOT_LOG_QUOTAS)
+
+
 @app.route('/logstream')
 @login_required
 def logstream_page():
     return render_template('logstream.html')
 
 
+@app.route('/logstream/rates')
+@login_required
+def logstream_rates():
+    """Per-bot log write rates (lines/s, bytes/s) as measured by the tailer."""
+    return jsonify({"status": "success", "rates": log_tailer.rates(), "ceiling": LOG_RATE_CEILING})
+
+
+@app.route('/logstream/health')
+@login_required
+def logstream_health():
+    """Per-bot errors/min, tracebacks/min and last exception, parsed from the live logs."""
+    return jsonify({"status": "success", "bots": log_tailer.health()})
+
+
 @app.route('/logstream/stream')
 @login_required
 def logstream_sse():
-    """Stream all supervisor stdout/stderr logs as Server-Sent Events."""
+    """Stream supervisor stdout/stderr logs as Server-Sent Events.
+
+    Optional query parameters narrow the stream server-side: bots (comma-separated),
+    stream (out|err), q (substring) or regex, level (minimum severity), plus
+    flush_ms and max_frame to tune batching.
+
+    Every frame's id stands for the (file, inode, offset) cursor reached so far; a client
+    that reconnects with Last-Event-ID (or ?last_event_id=) resumes from exactly there.
+    """
+    try:
+        log_filter = LogFilter.from_args(request.args)
+        flush_interval = min(max(int(request.args.get('flush_ms', LOGSTREAM_FLUSH_INTERVAL * 1000)), 0), 5000) / 1000
+        max_frame = min(max(int(request.args.get('max_frame', LOGSTREAM_MAX_FRAME_SIZE)), 1024), LOGSTREAM_MAX_FRAME_SIZE)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    resume = None
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    if last_event_id:
+        resume = stream_cursors.resolve(last_event_id)
+        if resume is None:
+            logger.warning(f"Unknown or expired Last-Event-ID {last_event_id[:64]!r}; starting a fresh stream")
+
     def generate():
-        log_dir = Path(SUPERVISOR_LOG_DIR)
-        # Track file positions
-        positions = {}
-        while True:
-            for log_file in sorted(log_dir.glob("*.log")):
-                if '_combined' in log_file.name:
-                    continue
-                try:
-                    pos = positions.get(log_file.name, 0)
-                    size = log_file.stat().st_size
-                    if size < pos:
-                        pos = 0  # file was truncated / rotated
-                    if size > pos:
-                        with log_file.open('r', errors='replace') as fh:
-                            fh.seek(pos)
-                            new_data = fh.read()
-                            positions[log_file.name] = fh.tell()
-                        if new_data.strip():
-                            payload = json.dumps({
-                                "file": log_file.name,
-                                "data": new_data
-                            })
-                            yield f"data: {payload}\n\n"
-                except Exception:
-                    pass
-            eventlet.sleep(1)
+        batcher = FrameBatcher(flush_interval, max_frame)
+        with stream_cursors.stream() as stream_key, log_tailer.subscribe(backlog=resume is None) as subscription:
+            live = {
+                name: position for name, position in subscription.positions.items()
+                if log_filter.matches_file(name)
+            }
+            # Resumed files start from the client's cursor and only advance as catch-up data
+            # is sent; every other file starts where the live subscription does.
+            cursor = dict(live)
+            if resume:
+                cursor.update((name, position) for name, position in resume.items() if log_filter.matches_file(name))
+            sent_id = None
+
+            def consume(chunk):
+                # Frames that fill up mid-chunk only vouch for the cursor before this chunk,
+                # so a resume may repeat part of it but never skips anything.
+                before = dict(cursor)
+                if log_filter.matches_file(chunk["file"]):
+                    cursor[chunk["file"]] = (chunk["inode"], chunk["end"])
+                text = log_filter.apply(chunk)
+                if not text:
+                    return []
+                return [(before, frame) for frame in batcher.add(chunk["file"], text)]
+
+            def render(position, frame):
+                nonlocal sent_id, last_sent
+                event_id = stream_cursors.issue(stream_key, position)
+                sent_id, last_sent = event_id, time.monotonic()
+                return f"id: {event_id}\ndata: {json.dumps({'chunks': frame})}\n\n"
+
+            last_sent = time.monotonic()
+            yield f"retry: {LOGSTREAM_RETRY_MS}\n\n"
+            if resume:
+                def caught_up(name):
+                    # Nothing of this file is left between the cursor and the live subscription
+                    if name in live:
+                        cursor[name] = live[name]
+                    else:
+                        cursor.pop(name, None)
+
+                current = None
+                for chunk in log_tailer.catch_up(resume, subscription.positions):
+                    if current is not None and chunk["file"] != current:
+                        caught_up(current)
+                    current = chunk["file"]
+                    for position, frame in consume(chunk):
+                        yield render(position, frame)
+                for name in list(cursor):
+                    caught_up(name)
+                if batcher.time_left() is not None:
+                    yield render(cursor, batcher.flush())
+
+            while True:
+                pending = batcher.time_left()
+                chunk = subscription.get(timeout=LOGSTREAM_KEEPALIVE if pending is None else pending)
+                frames = consume(chunk) if chunk is not None else []
+                if batcher.time_left() == 0:
+                    frames.append((dict(cursor), batcher.flush()))
+                for position, frame in frames:
+                    yield render(position, frame)
+                if time.monotonic() - last_sent >= LOGSTREAM_KEEPALIVE:
+                    event_id = stream_cursors.issue(stream_key, cursor)
+                    if event_id != sent_id:
+                        # Advances the client's Last-Event-ID past filtered-out lines. An id-only
+                        # event is never dispatched to scripts, so it carries a named, empty payload.
+                        sent_id = event_id
+                        yield f"id: {event_id}\nevent: cursor\ndata: {{}}\n\n"
+                    else:
+                        # Comment frame so dead connections are noticed and unsubscribed
+                        yield ": keepalive\n\n"
+                    last_sent = time.monotonic()
 
     return Response(
         stream_with_context(generate()),
@@ -645,10 +1144,11 @@ def config_cron():
 @login_required
 def clear_failure(process_name):
     """Clear the auto-pause / failure state for a process so it can run again."""
-    FAILURE_COUNTS[process_name] = 0
-    PAUSED_BY_SYSTEM.discard(process_name)
-    # Attempt to start it again via supervisor
-    run_supervisor_command("start", process_name)
+    with action_locks.hold([process_name], "clear_failure"):
+        FAILURE_COUNTS[process_name] = 0
+        PAUSED_BY_SYSTEM.discard(process_name)
+        # Attempt to start it again via supervisor
+        run_supervisor_command("start", process_name)
     broadcast_status_update()
     return jsonify({"status": "success", "message": f"Cleared failure state for {process_name}"})
 
@@ -666,7 +1166,8 @@ def _cron_restart_loop():
             continue
         logger.info("Cron restart: restarting all processes")
         try:
-            run_supervisor_command("restart", "all")
+            with action_locks.hold([p["name"] for p in get_processes()], "cron_restart"):
+                run_supervisor_command("restart", "all")
             broadcast_status_update()
         except Exception as e:
             logger.error(f"Cron restart error: {e}")
@@ -678,33 +1179,143 @@ def _start_cron_thread():
         _cron_thread = eventlet.spawn(_cron_restart_loop)
 
 
-def _auto_delete_logs_loop():
-    """Background loop that deletes all supervisor logs every 24 hours."""
+def _log_rotation_loop():
+    """Compress rotated/archived logs and enforce the per-bot and global log quotas."""
+    while True:
+        eventlet.sleep(LOG_ROTATION_INTERVAL)
+        try:
+            # Compression is CPU-bound; keep it off the hub so sockets stay responsive
+            tpool.execute(log_rotator.run_once)
+        except Exception as e:
+            logger.error(f"Log rotation error: {e}")
+
+
+_log_rotation_thread = None
+
+def _start_log_rotation_thread():
+    global _log_rotation_thread
+    if _log_rotation_thread is None or not _log_rotation_thread:
+        _log_rotation_thread = eventlet.spawn(_log_rotation_loop)
+
+
+def _process_event_loop():
+    """Receive PROCESS_STATE events forwarded by event_listener.py and push them to dashboards."""
+    path = Path(SUPERVISOR_EVENT_SOCKET)
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(str(path))
+    logger.info(f"Listening for supervisor state events on {path}")
+    while True:
+        try:
+            event = json.loads(sock.recv(65536))
+        except ValueError as e:
+            logger.error(f"Malformed supervisor state event: {e}")
+            continue
+        if event.get("group") == EVENT_LISTENER_NAME:
+            continue
+        name = event["name"] if event.get("group") == event["name"] else f"{event.get('group')}:{event['name']}"
+        socketio.emit('process_state', {
+            "name": name,
+            "status": event.get("state"),
+            "from_status": event.get("from_state"),
+            "pid": event.get("pid"),
+            "timestamp": datetime.utcnow().isoformat()
+        }, broadcast=True)
+        with _state_changed:
+            _state_changed.notify_all()
+        request_status_refresh()
+
+
+_event_receiver_thread = None
+
+def _start_event_receiver_thread():
+    global _event_receiver_thread
+    if _event_receiver_thread is None or not _event_receiver_thread:
+        _event_receiver_thread = eventlet.spawn(_process_event_loop)
+
+
+def _log_rates_loop():
+    """Push per-bot log write rates to dashboards; kept out of the status snapshot so it stays quiet."""
     while True:
-        eventlet.sleep(24 * 3600)
-        logger.info("Auto log cleanup: deleting all supervisor logs")
+        eventlet.sleep(LOG_RATES_INTERVAL)
         try:
-            log_dir = Path(SUPERVISOR_LOG_DIR)
-            deleted = 0
-            for log_file in log_dir.glob("*.log"):
-                try:
-                    log_file.unlink()
-                    deleted += 1
-                except Exception as e:
-                    logger.error(f"Failed to delete {log_file}: {e}")
-            logger.info(f"Auto log cleanup: deleted {deleted} log files")
+            socketio.emit('log_rates', log_tailer.rates(), broadcast=True)
         except Exception as e:
-            logger.error(f"Auto log cleanup error: {e}")
+            logger.error(f"Log rates push error: {e}")
+
+
+_log_rates_thread = None
+
+def _start_log_rates_thread():
+    global _log_rates_thread
+    if _log_rates_thread is None or not _log_rates_thread:
+        _log_rates_thread = eventlet.spawn(_log_rates_loop)
+
+
+def _log_index_loop():
+    """Keep the on-disk line/timestamp indexes caught up with growing logs."""
+    while True:
+        try:
+            # Scanning new bytes line by line is CPU-bound; keep it off the hub like rotation
+            tpool.execute(log_indexer.update_all)
+        except Exception as e:
+            logger.error(f"Log index loop error: {e}")
+        eventlet.sleep(LOG_INDEX_INTERVAL)
+
+
+def _remote_tip_loop():
+    """Check each bot checkout's remote branch tip in the background for fast-path restarts."""
+    while True:
+        try:
+            directories = filter(None, (process_directory(p["name"]) for p in get_status_snapshot()["processes"]))
+            remote_tips.refresh_all(directories)
+        except Exception as e:
+            logger.error(f"Remote tip loop error: {e}")
+        eventlet.sleep(REMOTE_TIP_INTERVAL)
+
+
+_remote_tip_thread = None
+
+def _start_remote_tip_thread():
+    global _remote_tip_thread
+    if _remote_tip_thread is None or not _remote_tip_thread:
+        _remote_tip_thread = eventlet.spawn(_remote_tip_loop)
+
+
+_log_index_thread = None
+
+def _start_log_index_thread():
+    global _log_index_thread
+    if _log_index_thread is None or not _log_index_thread:
+        _log_index_thread = eventlet.spawn(_log_index_loop)
+
+
+_log_tailer_thread = None
+
+def _start_log_tailer_thread():
+    global _log_tailer_thread
+    if _log_tailer_thread is None or not _log_tailer_thread:
+        log_tailer.start()
+        _log_tailer_thread = eventlet.spawn(log_tailer.run)
 
 
-_log_cleanup_thread = None
+_status_sampler_thread = None
 
-def _start_log_cleanup_thread():
-    global _log_cleanup_thread
-    if _log_cleanup_thread is None or not _log_cleanup_thread:
-        _log_cleanup_thread = eventlet.spawn(_auto_delete_logs_loop)
+def _start_status_sampler_thread():
+    global _status_sampler_thread
+    if _status_sampler_thread is None or not _status_sampler_thread:
+        _status_sampler_thread = eventlet.spawn(_status_sampler_loop)
 
 
 # Start background threads on import
+_start_status_sampler_thread()
 _start_cron_thread()
-_start_log_cleanup_thread()
+_start_log_rotation_thread()
+_start_event_receiver_thread()
+_start_log_tailer_thread()
+_start_log_index_thread()
+_start_log_rates_thread()
+_start_remote_tip_thread()
@@ -1,10 +1,15 @@
 let socket;
-let updateInterval;
 let reconnectAttempts = 0;
 const MAX_RECONNECT_ATTEMPTS = 5;
 
-// Keep a reference to the last known process list so cards never disappear
-let lastKnownProcesses = [];
+// Processes keyed by name, plus the snapshot version they reflect. The server sends
+// full snapshots on connect and deltas afterwards; a version gap triggers a resync.
+const processMap = new Map();
+const cardElements = new Map();
+let statusVersion = 0;
+let clockOffset = 0;
+// Per-bot log write rates, pushed separately from status so cards are patched in place
+let logRates = {};
 
 document.addEventListener('DOMContentLoaded', function () {
     socket = io({
@@ -17,14 +22,11 @@ document.addEventListener('DOMContentLoaded', function () {
     socket.on('connect', function () {
         console.log('Connected to server');
         reconnectAttempts = 0;
-        requestStatus();
-        if (updateInterval) clearInterval(updateInterval);
-        updateInterval = setInterval(requestStatus, 3000);
+        // The server sends a full snapshot on connect and pushes deltas after that.
     });
 
     socket.on('disconnect', function () {
         console.log('Disconnected from server');
-        if (updateInterval) clearInterval(updateInterval);
     });
 
     socket.on('connect_error', function (error) {
@@ -36,15 +38,35 @@ document.addEventListener('DOMContentLoaded', function () {
     });
 
     socket.on('status_update', function (data) {
-        if (data.processes && Array.isArray(data.processes) && data.processes.length > 0) {
-            lastKnownProcesses = data.processes;
-            updateBotCards(data.processes);
-        } else if (lastKnownProcesses.length > 0) {
-            // Don't wipe the grid – reuse last known data
-            updateBotCards(lastKnownProcesses);
+        if (!Array.isArray(data.processes)) return;
+        // Don't wipe the grid on an error snapshot – keep the last known cards
+        if (data.status !== 'success' && data.processes.length === 0) return;
+        statusVersion = data.version || 0;
+        syncClock(data.server_time);
+        const names = new Set(data.processes.map(p => p.name));
+        const removed = [...processMap.keys()].filter(name => !names.has(name));
+        applyStatusChanges(data.processes, removed);
+    });
+
+    socket.on('status_delta', function (delta) {
+        if (delta.base_version !== statusVersion) {
+            requestStatus();
+            return;
         }
+        statusVersion = delta.version;
+        syncClock(delta.server_time);
+        applyStatusChanges(delta.added.concat(delta.changed), delta.removed);
+    });
+
+    socket.on('job_update', handleJobUpdate);
+
+    socket.on('log_rates', function (rates) {
+        logRates = rates || {};
+        cardElements.forEach((card, name) => updateLogRate(card, name));
     });
 
+    setInterval(refreshUptimes, 1000);
+
     // Modal handling
     const modal = document.getElementById('log-modal');
     const span = modal ? modal.querySelector('.close') : null;
@@ -87,133 +109,320 @@ function formatBotName(processName) {
     return botNumber ? `Bot #${botNumber}` : processName;
 }
 
-function updateBotCards(processes) {
+function syncClock(serverTime) {
+    if (serverTime) clockOffset = serverTime - Date.now() / 1000;
+}
+
+function formatUptime(startedAt) {
+    if (!startedAt) return '0:00:00';
+    let seconds = Math.max(0, Math.floor(Date.now() / 1000 + clockOffset - startedAt));
+    const days = Math.floor(seconds / 86400);
+    seconds %= 86400;
+    const pad = (n) => String(n).padStart(2, '0');
+    const uptime = `${Math.floor(seconds / 3600)}:${pad(Math.floor(seconds % 3600 / 60))}:${pad(seconds % 60)}`;
+    return days ? `${days} day${days !== 1 ? 's' : ''}, ${uptime}` : uptime;
+}
+
+function applyStatusChanges(updated, removed) {
     const botGrid = document.getElementById('bot-grid');
     if (!botGrid) return;
 
-    const sorted = sortProcesses(processes);
+    removed.forEach((name) => {
+        processMap.delete(name);
+        selectedBots.delete(name);
+        const card = cardElements.get(name);
+        if (card) card.remove();
+        cardElements.delete(name);
+    });
 
-    // Stats
-    let online = 0, offline = 0, paused = 0;
+    let added = false;
+    updated.forEach((process) => {
+        processMap.set(process.name, process);
+        let card = cardElements.get(process.name);
+        if (!card) {
+            card = document.createElement('div');
+            cardElements.set(process.name, card);
+            added = true;
+        }
+        renderBotCard(card, process);
+    });
 
-    botGrid.innerHTML = '';
+    if (added) {
+        // Re-append in bot order; appendChild moves existing nodes without re-rendering them
+        sortProcesses([...processMap.values()]).forEach(p => botGrid.appendChild(cardElements.get(p.name)));
+    }
+    updateStats();
+    updateBulkBar();
+}
 
-    sorted.forEach((process) => {
-        const isRunning = process.status === 'RUNNING';
-        const isPaused = process.paused;
-        const isAutoPaused = process.auto_paused;
-        const isFatal = process.status === 'FATAL' || process.status === 'BACKOFF';
+function renderBotCard(card, process) {
+    const isRunning = process.status === 'RUNNING';
+    const isPaused = process.paused;
+    const isAutoPaused = process.auto_paused;
+
+    const displayName = formatBotName(process.name);
+    const utcTime = new Date().toISOString().replace('T', ' ').slice(0, 19);
+
+    let statusClass, statusLabel;
+    if (isAutoPaused) {
+        statusClass = 'status-fatal';
+        statusLabel = 'Failed';
+    } else if (isPaused) {
+        statusClass = 'status-paused';
+        statusLabel = 'Paused';
+    } else if (isRunning) {
+        statusClass = 'status-online';
+        statusLabel = 'Online';
+    } else {
+        statusClass = 'status-offline';
+        statusLabel = 'Offline';
+    }
 
-        if (isRunning && !isPaused && !isAutoPaused) online++;
-        else if (isPaused || isAutoPaused) paused++;
-        else offline++;
+    card.className = 'bot-card' + (isAutoPaused ? ' card-fatal' : '');
 
-        const displayName = formatBotName(process.name);
-        const now = new Date();
-        const utcTime = now.toISOString().replace('T', ' ').slice(0, 19);
-
-        let statusClass, statusLabel;
-        if (isAutoPaused) {
-            statusClass = 'status-fatal';
-            statusLabel = 'Failed';
-        } else if (isPaused) {
-            statusClass = 'status-paused';
-            statusLabel = 'Paused';
-        } else if (isRunning) {
-            statusClass = 'status-online';
-            statusLabel = 'Online';
-        } else {
-            statusClass = 'status-offline';
-            statusLabel = 'Offline';
-        }
+    let controlsHTML = '';
+    if (isAutoPaused) {
+        // Show a "Clear Failure" button for auto-paused bots
+        controlsHTML = `
+            <button onclick="clearFailure('${process.name}')" class="control-btn clear-btn">Clear &amp; Restart</button>
+            <button onclick="viewLogs('${process.name}')" class="control-btn log-btn">Logs</button>
+        `;
+    } else {
+        controlsHTML = `
+            <button onclick="toggleBot('${process.name}', '${process.status}')"
+                    class="control-btn ${isRunning ? 'stop-btn' : 'start-btn'}">
+                ${isRunning ? 'Stop' : 'Start'}
+            </button>
+            <button onclick="restartBot('${process.name}', event)"
+                    title="Shift-click for a full restart (cleanup and git pull even if the code is unchanged)"
+                    class="control-btn restart-btn" ${!isRunning ? 'disabled' : ''}>
+                Restart
+            </button>
+            <button onclick="${isPaused ? `resumeBot('${process.name}')` : `pauseBot('${process.name}')`}"
+                    class="control-btn pause-btn" ${!isRunning ? 'disabled' : ''}>
+                ${isPaused ? 'Resume' : 'Pause'}
+            </button>
+            <button onclick="viewLogs('${process.name}')" class="control-btn log-btn">Logs</button>
+        `;
+    }
 
-        const card = document.createElement('div');
-        card.className = 'bot-card' + (isAutoPaused ? ' card-fatal' : '');
-
-        let controlsHTML = '';
-        if (isAutoPaused) {
-            // Show a "Clear Failure" button for auto-paused bots
-            controlsHTML = `
-                <button onclick="clearFailure('${process.name}')" class="control-btn clear-btn">Clear &amp; Restart</button>
-                <button onclick="viewLogs('${process.name}')" class="control-btn log-btn">Logs</button>
-            `;
-        } else {
-            controlsHTML = `
-                <button onclick="toggleBot('${process.name}', '${process.status}')"
-                        class="control-btn ${isRunning ? 'stop-btn' : 'start-btn'}">
-                    ${isRunning ? 'Stop' : 'Start'}
-                </button>
-                <button onclick="restartBot('${process.name}')"
-                        class="control-btn restart-btn" ${!isRunning ? 'disabled' : ''}>
-                    Restart
-                </button>
-                <button onclick="${isPaused ? `resumeBot('${process.name}')` : `pauseBot('${process.name}')`}"
-                        class="control-btn pause-btn" ${!isRunning ? 'disabled' : ''}>
-                    ${isPaused ? 'Resume' : 'Pause'}
-                </button>
-                <button onclick="viewLogs('${process.name}')" class="control-btn log-btn">Logs</button>
-            `;
-        }
+    card.innerHTML = `
+        <div class="bot-header">
+            <h2><input type="checkbox" class="bot-select" onchange="toggleSelection('${process.name}', this.checked)"
+                       ${selectedBots.has(process.name) ? 'checked' : ''}>${displayName}</h2>
+            <span class="bot-status ${statusClass}">${statusLabel}</span>
+        </div>
+        <div class="bot-info">
+            <p><strong>Process:</strong> ${process.name}</p>
+            <p><strong>Status:</strong> ${process.status}</p>
+            <p><strong>PID:</strong> ${process.pid || 'N/A'}</p>
+            <p><strong>Uptime:</strong> <span class="uptime-value">${formatUptime(process.started_at)}</span></p>
+            <p class="${process.errors_per_min || process.tracebacks_per_min ? 'log-errors' : ''}"><strong>Errors:</strong> ${formatErrorRates(process)}</p>
+            <p><strong>Log rate:</strong> <span class="log-rate-value">${formatLogRate(logRates[process.name])}</span></p>
+            <p><strong>Updated:</strong> ${utcTime}</p>
+        </div>
+        <div class="bot-controls">${controlsHTML}</div>
+    `;
+    if (busyCards.has(process.name)) showBusy(card, busyCards.get(process.name));
+}
 
-        card.innerHTML = `
-            <div class="bot-header">
-                <h2>${displayName}</h2>
-                <span class="bot-status ${statusClass}">${statusLabel}</span>
-            </div>
-            <div class="bot-info">
-                <p><strong>Process:</strong> ${process.name}</p>
-                <p><strong>Status:</strong> ${process.status}</p>
-                <p><strong>PID:</strong> ${process.pid || 'N/A'}</p>
-                <p><strong>Uptime:</strong> ${process.uptime || '0:00:00'}</p>
-                <p><strong>Updated:</strong> ${utcTime}</p>
-            </div>
-            <div class="bot-controls">${controlsHTML}</div>
-        `;
+function formatErrorRates(process) {
+    const errors = process.errors_per_min || 0;
+    const tracebacks = process.tracebacks_per_min || 0;
+    let text = `${errors}/min, ${tracebacks} traceback${tracebacks === 1 ? '' : 's'}/min`;
+    if (process.last_exception) text += ` (last: ${process.last_exception.type})`;
+    return text;
+}
+
+function formatLogRate(rate) {
+    if (!rate) return '–';
+    const bytes = rate.bytes_per_sec;
+    const size = bytes >= 1048576 ? `${(bytes / 1048576).toFixed(1)} MB`
+        : bytes >= 1024 ? `${(bytes / 1024).toFixed(1)} KB` : `${bytes} B`;
+    return `${rate.lines_per_sec} lines/s · ${size}/s`;
+}
+
+function updateLogRate(card, name) {
+    const el = card.querySelector('.log-rate-value');
+    if (el) el.textContent = formatLogRate(logRates[name]);
+}
 
-        botGrid.appendChild(card);
+function refreshUptimes() {
+    if (document.hidden) return;
+    processMap.forEach((process, name) => {
+        if (!process.started_at) return;
+        const el = cardElements.get(name).querySelector('.uptime-value');
+        if (el) el.textContent = formatUptime(process.started_at);
+    });
+}
+
+function updateStats() {
+    let online = 0, offline = 0, paused = 0;
+    processMap.forEach((process) => {
+        const isRunning = process.status === 'RUNNING';
+        if (isRunning && !process.paused && !process.auto_paused) online++;
+        else if (process.paused || process.auto_paused) paused++;
+        else offline++;
     });
 
     // Update header stats
+    const total = processMap.size;
     const el = (id) => document.getElementById(id);
     if (el('stat-online')) el('stat-online').textContent = online;
     if (el('stat-offline')) el('stat-offline').textContent = offline;
     if (el('stat-paused')) el('stat-paused').textContent = paused;
-    if (el('bot-count-badge')) el('bot-count-badge').textContent = `${sorted.length} bot${sorted.length !== 1 ? 's' : ''}`;
+    if (el('bot-count-badge')) el('bot-count-badge').textContent = `${total} bot${total !== 1 ? 's' : ''}`;
 }
 
 // ── Bot actions ──────────────────────────────────────────
 
-function toggleBot(processName, currentStatus) {
-    const action = currentStatus === 'RUNNING' ? 'stop' : 'start';
-    if (action === 'stop') {
-        if (!confirm(`Stop ${formatBotName(processName)}?`)) return;
-    }
-    fetch(`/supervisor/${action}/${processName}`, { method: 'POST' })
+// Jobs queued from this tab; their failures are reported when the job finishes
+const pendingJobs = new Map();
+// Latest update of jobs not (yet) known to this tab: a fast job can finish before the POST
+// that queued it returns its id, so updates are kept until trackJob claims them
+const earlyJobUpdates = new Map();
+const EARLY_JOB_UPDATES_MAX = 100;
+// Progress line per bot with a job in flight; survives card re-renders from status deltas
+const busyCards = new Map();
+
+function submitAction(action, processName, query = '') {
+    fetch(`/supervisor/${action}/${processName}${query}`, { method: 'POST' })
         .then(r => r.json())
         .then(data => {
-            if (data.status === 'success') setTimeout(requestStatus, 1000);
-            else alert(`Error: ${data.message}`);
+            if (data.status === 'accepted') {
+                setCardBusy(processName, `${action.charAt(0).toUpperCase() + action.slice(1)} queued…`);
+                trackJob(data.job_id, processName);
+            } else {
+                alert(`Error: ${data.message}`);
+            }
         })
         .catch(() => alert(`Failed to ${action} the process.`));
 }
 
-function restartBot(processName) {
-    if (!confirm(`Restart ${formatBotName(processName)}?`)) return;
-    fetch(`/supervisor/restart/${processName}`, { method: 'POST' })
+function setCardBusy(processName, message) {
+    busyCards.set(processName, message);
+    const card = cardElements.get(processName);
+    if (card) showBusy(card, message);
+}
+
+function showBusy(card, message) {
+    let el = card.querySelector('.job-progress');
+    if (!el) {
+        el = document.createElement('p');
+        el.className = 'job-progress';
+        card.querySelector('.bot-info').appendChild(el);
+    }
+    el.textContent = message;
+    card.querySelectorAll('.bot-controls button').forEach(btn => { btn.disabled = true; });
+}
+
+function trackJob(jobId, target) {
+    pendingJobs.set(jobId, target);
+    const early = earlyJobUpdates.get(jobId);
+    if (early) {
+        earlyJobUpdates.delete(jobId);
+        handleJobUpdate(early);
+    }
+}
+
+function handleJobUpdate(job) {
+    if (!pendingJobs.has(job.id)) {
+        // Possibly ours with the POST still in flight; other tabs' jobs just age out
+        earlyJobUpdates.delete(job.id);
+        earlyJobUpdates.set(job.id, job);
+        if (earlyJobUpdates.size > EARLY_JOB_UPDATES_MAX) {
+            earlyJobUpdates.delete(earlyJobUpdates.keys().next().value);
+        }
+        return;
+    }
+    // Bulk jobs target a list of processes
+    const targets = [].concat(job.target);
+    if (job.state === 'queued' || job.state === 'running') {
+        targets.forEach(name => setCardBusy(name, job.message || `${job.action} ${job.state}…`));
+        return;
+    }
+    pendingJobs.delete(job.id);
+    targets.forEach(name => {
+        busyCards.delete(name);
+        // Re-render from the latest known state to drop the progress line and re-enable buttons
+        const process = processMap.get(name);
+        const card = cardElements.get(name);
+        if (process && card) renderBotCard(card, process);
+    });
+    if (job.state === 'failed') alert(`Error: ${job.message}`);
+}
+
+// ── Bulk actions ─────────────────────────────────────────
+
+const selectedBots = new Set();
+
+function toggleSelection(processName, checked) {
+    if (checked) selectedBots.add(processName);
+    else selectedBots.delete(processName);
+    updateBulkBar();
+}
+
+function selectAllBots(checked) {
+    selectedBots.clear();
+    if (checked) processMap.forEach((_, name) => selectedBots.add(name));
+    cardElements.forEach((card, name) => {
+        const box = card.querySelector('.bot-select');
+        if (box) box.checked = selectedBots.has(name);
+    });
+    updateBulkBar();
+}
+
+function updateBulkBar() {
+    const count = selectedBots.size;
+    const label = document.getElementById('selected-count');
+    if (label) label.textContent = `${count} selected`;
+    const all = document.getElementById('select-all');
+    if (all) all.checked = count > 0 && count === processMap.size;
+    document.querySelectorAll('#bulk-bar .bulk-btn:not(.bulk-failed)').forEach(btn => { btn.disabled = count === 0; });
+}
+
+function bulkAction(action, selector) {
+    const body = selector ? { action, selector } : { action, names: [...selectedBots] };
+    const what = selector ? `all ${selector} bots` : `${selectedBots.size} bot${selectedBots.size === 1 ? '' : 's'}`;
+    if (!confirm(`${action.charAt(0).toUpperCase() + action.slice(1)} ${what}?`)) return;
+    fetch('/supervisor/bulk', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    })
         .then(r => r.json())
         .then(data => {
-            if (data.status === 'success') setTimeout(requestStatus, 2000);
-            else alert(`Error: ${data.message}`);
+            if (data.status !== 'accepted') {
+                alert(`Error: ${data.message}`);
+                return;
+            }
+            data.processes.forEach(name => setCardBusy(name, `${action} queued…`));
+            trackJob(data.job_id, data.processes);
+            if (!selector) selectAllBots(false);
         })
-        .catch(() => alert('Failed to restart the process.'));
+        .catch(() => alert(`Failed to ${action} the selected bots.`));
+}
+
+function toggleBot(processName, currentStatus) {
+    const action = currentStatus === 'RUNNING' ? 'stop' : 'start';
+    if (action === 'stop') {
+        if (!confirm(`Stop ${formatBotName(processName)}?`)) return;
+    }
+    submitAction(action, processName);
+}
+
+function restartBot(processName, event) {
+    // Restart skips cleanup and git pull when the code is already at the remote tip
+    const full = Boolean(event && event.shiftKey);
+    if (!confirm(`${full ? 'Fully restart' : 'Restart'} ${formatBotName(processName)}?`)) return;
+    submitAction('restart', processName, full ? '?full=1' : '');
 }
 
 function pauseBot(processName) {
     fetch(`/supervisor/pause/${processName}`, { method: 'POST' })
         .then(r => r.json())
         .then(data => {
-            if (data.status === 'success') setTimeout(requestStatus, 1000);
-            else alert(`Error: ${data.message}`);
+            if (data.status !== 'success') alert(`Error: ${data.message}`);
         });
 }
 
@@ -221,8 +430,7 @@ function resumeBot(processName) {
     fetch(`/supervisor/resume/${processName}`, { method: 'POST' })
         .then(r => r.json())
         .then(data => {
-            if (data.status === 'success') setTimeout(requestStatus, 1000);
-            else alert(`Error: ${data.message}`);
+            if (data.status !== 'success') alert(`Error: ${data.message}`);
         });
 }
 
@@ -230,30 +438,34 @@ function clearFailure(processName) {
     fetch(`/supervisor/clear_failure/${processName}`, { method: 'POST' })
         .then(r => r.json())
         .then(data => {
-            if (data.status === 'success') setTimeout(requestStatus, 1500);
-            else alert(`Error: ${data.message}`);
+            if (data.status !== 'success') alert(`Error: ${data.message}`);
         })
         .catch(() => alert('Failed to clear failure state.'));
 }
 
+const LOG_PREVIEW_LINES = 500;
+
 function viewLogs(processName) {
-    fetch(`/supervisor/log/${processName}`)
+    const modal = document.getElementById('log-modal');
+    const content = document.getElementById('log-content');
+    const name = encodeURIComponent(processName);
+    document.getElementById('log-download').href = `/supervisor/log/${name}`;
+    content.textContent = 'Loading...';
+    modal.style.display = 'block';
+    // Only the tail is fetched for the preview; the full log is a streamed download
+    fetch(`/supervisor/log/${name}?tail=${LOG_PREVIEW_LINES}`)
         .then(response => {
             if (!response.ok) throw new Error(`HTTP ${response.status}`);
-            return response.blob();
+            return response.text();
         })
-        .then(blob => {
-            const url = window.URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.style.display = 'none';
-            a.href = url;
-            a.download = `${processName}_log.txt`;
-            document.body.appendChild(a);
-            a.click();
-            window.URL.revokeObjectURL(url);
-            document.body.removeChild(a);
+        .then(text => {
+            content.textContent = text;
+            content.scrollTop = content.scrollHeight;
         })
-        .catch(() => alert('Failed to fetch logs.'));
+        .catch(() => {
+            content.textContent = '';
+            alert('Failed to fetch logs.');
+        });
 }
 
 // ── Cron modal ───────────────────────────────────────────
@@ -298,15 +510,9 @@ function saveCron() {
 // ── Visibility handling ──────────────────────────────────
 
 document.addEventListener('visibilitychange', function () {
-    if (document.hidden) {
-        if (updateInterval) clearInterval(updateInterval);
-    } else {
-        requestStatus();
-        updateInterval = setInterval(requestStatus, 3000);
-    }
+    if (!document.hidden) requestStatus();
 });
 
 window.onbeforeunload = function () {
     if (socket) socket.disconnect();
-    if (updateInterval) clearInterval(updateInterval);
 };
@@ -0,0 +1,174 @@
+import time
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager, ExitStack
+
+import eventlet
+from eventlet.event import Event
+
+logger = logging.getLogger(__name__)
+
+
+class _WaitStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "avg_wait": round(self.total / self.count, 3) if self.count else None,
+            "max_wait": round(self.max, 3),
+            "last_wait": round(self.last, 3) if self.last is not None else None,
+        }
+
+
+class ActionLocks:
+    """One lock per process, so control actions on the same bot run one after another.
+
+    Locks are not reentrant: take them once around a whole action (start/stop/restart,
+    cleanup, code update), never again inside it.
+    """
+
+    def __init__(self):
+        self._locks = defaultdict(threading.Lock)
+        self._guard = threading.Lock()
+        self.waiting = defaultdict(int)
+        self.holders = {}
+        self.waits = _WaitStats()
+
+    @contextmanager
+    def hold(self, names, action, on_wait=None):
+        """Hold the locks of all `names` (taken in sorted order, so batches cannot deadlock).
+
+        on_wait(holders) is called once if another action has to finish first.
+        """
+        names = sorted(set(names))
+        started = time.time()
+        with self._guard:
+            busy = {name: self.holders[name]["action"] for name in names if name in self.holders}
+            locks = [self._locks[name] for name in names]
+            for name in names:
+                self.waiting[name] += 1
+        if busy and on_wait:
+            on_wait(busy)
+
+        with ExitStack() as stack:
+            try:
+                for lock in locks:
+                    stack.enter_context(lock)
+            finally:
+                with self._guard:
+                    for name in names:
+                        self.waiting[name] -= 1
+                        if not self.waiting[name]:
+                            del self.waiting[name]
+            waited = time.time() - started
+            with self._guard:
+                self.waits.record(waited)
+                for name in names:
+                    self.holders[name] = {"action": action, "since": time.time()}
+            if busy:
+                logger.info(f"{action} on {', '.join(names)} waited {waited:.2f}s for {busy}")
+            try:
+                yield
+            finally:
+                with self._guard:
+                    for name in names:
+                        self.holders.pop(name, None)
+
+    def metrics(self):
+        now = time.time()
+        with self._guard:
+            processes = {}
+            for name in set(self.holders) | set(self.waiting):
+                holder = self.holders.get(name)
+                processes[name] = {
+                    "action": holder["action"] if holder else None,
+                    "held_for": round(now - holder["since"], 3) if holder else None,
+                    "queue_depth": self.waiting.get(name, 0),
+                }
+            return {
+                "queue_depth": sum(self.waiting.values()),
+                "waits": self.waits.to_dict(),
+                "processes": processes,
+            }
+
+
+class _ReloadBatch:
+    def __init__(self):
+        self.names = set()
+        self.everything = False
+        self.requests = 0
+        self.done = Event()
+
+
+class ReloadCoalescer:
+    """Merge config reload requests arriving within `window` seconds into one reload(names).
+
+    Every caller blocks until the shared reload has run and gets its result. A request made
+    while a reload is already in flight opens the next batch, since that reload may have
+    read the config before the caller changed it.
+    """
+
+    def __init__(self, reload, window):
+        self.reload = reload
+        self.window = window
+        self._batch = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.reloads = 0
+        self.waits = _WaitStats()
+
+    def request(self, names=None):
+        started = time.time()
+        with self._lock:
+            self.requests += 1
+            batch = self._batch
+            if batch is None:
+                batch = self._batch = _ReloadBatch()
+                eventlet.spawn_after(self.window, self._flush, batch)
+            if names is None:
+                batch.everything = True
+            else:
+                batch.names.update(names)
+            batch.requests += 1
+        ok, result = batch.done.wait()
+        with self._lock:
+            self.waits.record(time.time() - started)
+        if not ok:
+            raise result
+        return result
+
+    def _flush(self, batch):
+        with self._lock:
+            self._batch = None
+            self.reloads += 1
+        names = None if batch.everything else sorted(batch.names)
+        if batch.requests > 1:
+            logger.info(f"Coalesced {batch.requests} config reload requests into one")
+        try:
+            batch.done.send((True, self.reload(names)))
+        except Exception as e:
+            logger.error(f"Config reload failed: {e}")
+            batch.done.send((False, e))
+
+    def metrics(self):
+        with self._lock:
+            pending = self._batch.requests if self._batch else 0
+            return {
+                "pending": pending,
+                "requests": self.requests,
+                "reloads": self.reloads,
+                "coalesced": self.requests - pending - self.reloads,
+                "waits": self.waits.to_dict(),
+            }
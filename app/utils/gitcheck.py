@@ -0,0 +1,77 @@
+import time
+import logging
+import subprocess
+import threading
+
+logger = logging.getLogger(__name__)
+
+GIT_TIMEOUT = 20
+
+
+def _git(directory, *args):
+    result = subprocess.run(['git', *args], cwd=directory, capture_output=True, text=True, timeout=GIT_TIMEOUT)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout.strip()
+
+
+def local_head(directory):
+    """(branch, commit) of a checkout, or None if it cannot be read."""
+    try:
+        return _git(directory, 'symbolic-ref', '--short', 'HEAD'), _git(directory, 'rev-parse', 'HEAD')
+    except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"Cannot read HEAD of {directory}: {e}")
+        return None
+
+
+def remote_tip(directory, branch):
+    """Commit the checkout's origin currently has for `branch`; ls-remote fetches no objects."""
+    output = _git(directory, 'ls-remote', 'origin', f'refs/heads/{branch}')
+    return output.split()[0] if output else None
+
+
+class RemoteTips:
+    """Remote branch tips per checkout, refreshed in the background so restarts need not wait on the network."""
+
+    def __init__(self, max_age):
+        self.max_age = max_age
+        self.tips = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, directory):
+        head = local_head(directory)
+        if head is None:
+            return None
+        branch = head[0]
+        try:
+            tip = remote_tip(directory, branch)
+        except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Cannot check remote tip of {directory} ({branch}): {e}")
+            tip = None
+        with self._lock:
+            self.tips[directory] = {"branch": branch, "tip": tip, "checked_at": time.time()}
+        return tip
+
+    def refresh_all(self, directories):
+        directories = set(directories)
+        for directory in sorted(directories):
+            self.refresh(directory)
+        with self._lock:
+            for directory in set(self.tips) - directories:
+                del self.tips[directory]
+
+    def get(self, directory, branch):
+        """Cached tip for the checkout's branch, checked now if missing or older than max_age."""
+        with self._lock:
+            entry = self.tips.get(directory)
+        if entry and entry["branch"] == branch and time.time() - entry["checked_at"] <= self.max_age:
+            return entry["tip"]
+        return self.refresh(directory)
+
+    def is_current(self, directory):
+        """(current, commit): current is True only if HEAD is known to equal the remote tip."""
+        head = local_head(directory)
+        if head is None:
+            return False, None
+        branch, commit = head
+        return self.get(directory, branch) == commit, commit
@@ -0,0 +1,106 @@
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+
+import eventlet
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ("queued", "running", "succeeded", "failed")
+
+
+class JobFailed(Exception):
+    """Raised by a job body to fail the job with a user-facing message."""
+
+
+class Job:
+    def __init__(self, action, target):
+        self.id = uuid.uuid4().hex[:12]
+        self.action = action
+        self.target = target
+        self.state = "queued"
+        self.message = None
+        self.steps = []
+        self.result = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        end = self.finished_at or time.time()
+        return {
+            "id": self.id,
+            "action": self.action,
+            "target": self.target,
+            "state": self.state,
+            "message": self.message,
+            "steps": self.steps,
+            "result": self.result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queued_seconds": round((self.started_at or end) - self.created_at, 3),
+            "run_seconds": round(end - self.started_at, 3) if self.started_at else None,
+        }
+
+
+class JobRunner:
+    """Run control actions in a bounded green pool and report each transition to `notify`."""
+
+    def __init__(self, workers, notify, retention=500):
+        self.pool = eventlet.GreenPool(workers)
+        self.notify = notify
+        self.retention = retention
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, action, target, func, *args):
+        """Queue func(job, *args) and return the Job immediately."""
+        job = Job(action, target)
+        with self._lock:
+            self.jobs[job.id] = job
+            while len(self.jobs) > self.retention:
+                self.jobs.popitem(last=False)
+        self._publish(job)
+        # spawn_n would block the request when the pool is full; queue in a greenlet instead
+        eventlet.spawn_n(self.pool.spawn_n, self._run, job, func, args)
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def recent(self, limit=50):
+        with self._lock:
+            return [job.to_dict() for job in reversed(list(self.jobs.values())[-limit:])]
+
+    def progress(self, job, message):
+        job.steps.append({"at": time.time(), "message": message})
+        job.message = message
+        self._publish(job)
+
+    def _run(self, job, func, args):
+        job.state = "running"
+        job.started_at = time.time()
+        self._publish(job)
+        try:
+            message = func(job, *args)
+            job.state = "succeeded"
+            job.message = message or job.message
+        except JobFailed as e:
+            job.state = "failed"
+            job.message = str(e)
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.action} {job.target}) crashed: {e}")
+            job.state = "failed"
+            job.message = f"Error during {job.action}: {e}"
+        job.finished_at = time.time()
+        logger.info(f"Job {job.id} {job.action} {job.target}: {job.state} - {job.message}")
+        self._publish(job)
+
+    def _publish(self, job):
+        try:
+            self.notify(job.to_dict())
+        except Exception as e:
+            logger.error(f"Could not publish job {job.id}: {e}")
@@ -0,0 +1,154 @@
+import os
+import re
+import zlib
+from datetime import datetime
+
+BLOCK_SIZE = 64 * 1024
+MAX_TAIL_LINES = 100000
+
+_TIMESTAMP_RE = re.compile(rb'^\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})')
+
+
+def parse_since(value):
+    """Parse an epoch or ISO-8601 timestamp into a naive local datetime; raises ValueError."""
+    try:
+        return datetime.fromtimestamp(float(value))
+    except (OverflowError, OSError) as e:
+        raise ValueError(f"timestamp out of range: {value}") from e
+    except ValueError:
+        pass
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def line_timestamp(line):
+    match = _TIMESTAMP_RE.match(line)
+    if not match:
+        return None
+    try:
+        return datetime.fromisoformat(match.group(1).decode().replace(' ', 'T'))
+    except ValueError:
+        return None
+
+
+def _reverse_lines(fh, end):
+    """Yield (offset, line) pairs from end of file backwards, one block in memory at a time."""
+    position = end
+    tail = b''
+    while position > 0:
+        step = min(BLOCK_SIZE, position)
+        position -= step
+        fh.seek(position)
+        block = fh.read(step) + tail
+        lines = block.split(b'\n')
+        # The first piece may be the end of a line that starts in an earlier block
+        tail = lines.pop(0)
+        offset = position + len(tail) + 1
+        found = []
+        for line in lines:
+            found.append((offset, line))
+            offset += len(line) + 1
+        yield from reversed(found)
+    if tail:
+        yield 0, tail
+
+
+def tail_offset(path, lines, end):
+    """Offset where the last `lines` lines of the first `end` bytes of path begin."""
+    with open(path, 'rb') as fh:
+        seen = 0
+        for offset, line in _reverse_lines(fh, end):
+            if offset >= end:
+                continue  # the empty piece after a trailing newline
+            seen += 1
+            if seen >= lines:
+                return offset
+    return 0
+
+
+def since_offset(path, since, end):
+    """Offset of the first line stamped at or after `since`, scanning backwards from `end`.
+
+    Lines without a timestamp (tracebacks, wrapped output) travel with the stamped line above them.
+    """
+    start = end
+    with open(path, 'rb') as fh:
+        for offset, line in _reverse_lines(fh, end):
+            stamp = line_timestamp(line)
+            if stamp is None:
+                continue
+            if stamp < since:
+                break
+            start = offset
+        else:
+            return 0
+    return start
+
+
+class Segment:
+    """A byte range of a file, or literal bytes, within a virtual concatenated download."""
+
+    def __init__(self, path=None, start=0, end=0, data=None):
+        self.path = path
+        self.data = data
+        self.start = start
+        self.end = len(data) if data is not None else end
+
+    @property
+    def length(self):
+        return self.end - self.start
+
+    def read(self, skip, limit):
+        """Yield up to `limit` bytes starting `skip` bytes into the segment."""
+        if self.data is not None:
+            yield self.data[self.start + skip:self.start + skip + limit]
+            return
+        position = self.start + skip
+        stop = min(self.end, position + limit)
+        with open(self.path, 'rb') as fh:
+            fh.seek(position)
+            while position < stop:
+                block = fh.read(min(BLOCK_SIZE, stop - position))
+                if not block:
+                    break
+                position += len(block)
+                yield block
+
+
+def total_length(segments):
+    return sum(segment.length for segment in segments)
+
+
+def iter_range(segments, start=0, stop=None):
+    """Stream bytes [start, stop) of the concatenated segments without loading any file."""
+    if stop is None:
+        stop = total_length(segments)
+    position = 0
+    for segment in segments:
+        seg_start, seg_stop = position, position + segment.length
+        position = seg_stop
+        if seg_stop <= start:
+            continue
+        if seg_start >= stop:
+            break
+        skip = max(0, start - seg_start)
+        yield from segment.read(skip, min(seg_stop, stop) - seg_start - skip)
+
+
+def gzip_stream(chunks, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def file_snapshot(path):
+    """Stat a log once: its size bounds a consistent download, and inode/size/mtime validate resumes."""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
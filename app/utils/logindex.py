@@ -0,0 +1,203 @@
+import os
+import json
+import bisect
+import logging
+from pathlib import Path
+
+from eventlet.patcher import original
+
+from app.utils.logfiles import BLOCK_SIZE, line_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Indexes are built and read on tpool's native threads, so their locks must be native as well
+threading = original('threading')
+
+INDEX_STRIDE = 1000
+INDEX_VERSION = 1
+
+
+def is_indexed_log(name):
+    return name.endswith('_out.log') or name.endswith('_err.log')
+
+
+class LogIndex:
+    """Sparse line/timestamp -> byte offset index for one log file, persisted next to the logs.
+
+    Every INDEX_STRIDE-th line gets an entry [line, offset, ts], where ts is the last
+    timestamp seen at or before that line (epoch seconds, or None before the first one).
+    """
+
+    def __init__(self, log_path, index_path):
+        self.log_path = Path(log_path)
+        self.index_path = Path(index_path)
+        self.lock = threading.Lock()
+        self._reset(None)
+        self._load()
+
+    def _reset(self, inode):
+        self.inode = inode
+        self.size = 0
+        self.lines = 0
+        self.last_ts = None
+        self.entries = [[0, 0, None]]
+
+    def _load(self):
+        try:
+            data = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self.inode = data["inode"]
+        self.size = data["size"]
+        self.lines = data["lines"]
+        self.last_ts = data["last_ts"]
+        self.entries = data["entries"]
+
+    def _save(self):
+        tmp = self.index_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({
+            "version": INDEX_VERSION,
+            "inode": self.inode,
+            "size": self.size,
+            "lines": self.lines,
+            "last_ts": self.last_ts,
+            "entries": self.entries,
+        }))
+        os.replace(tmp, self.index_path)
+
+    def update(self):
+        """Index lines appended since the last update; start over after rotation or truncation."""
+        with self.lock:
+            try:
+                st = self.log_path.stat()
+            except FileNotFoundError:
+                return False
+            if st.st_ino != self.inode or st.st_size < self.size:
+                self._reset(st.st_ino)
+            if st.st_size == self.size:
+                return False
+            with self.log_path.open('rb') as fh:
+                fh.seek(self.size)
+                remaining = st.st_size - self.size
+                carry = b''
+                while remaining > 0:
+                    block = fh.read(min(BLOCK_SIZE, remaining))
+                    if not block:
+                        break
+                    remaining -= len(block)
+                    lines = (carry + block).split(b'\n')
+                    carry = lines.pop()  # an incomplete last line waits for the next update
+                    for line in lines:
+                        self._index_line(line)
+            self._save()
+            return True
+
+    def _index_line(self, line):
+        stamp = line_timestamp(line)
+        if stamp is not None:
+            self.last_ts = stamp.timestamp()
+        self.size += len(line) + 1
+        self.lines += 1
+        if self.lines % INDEX_STRIDE == 0:
+            self.entries.append([self.lines, self.size, self.last_ts])
+
+    def seek_line(self, line):
+        """Return (line, offset) of the closest indexed line at or before `line`."""
+        with self.lock:
+            pos = bisect.bisect_right([entry[0] for entry in self.entries], line) - 1
+            entry = self.entries[max(pos, 0)]
+        return entry[0], entry[1]
+
+    def seek_time(self, ts):
+        """Return (line, offset) of an indexed line known to come before the first line stamped at or after ts."""
+        with self.lock:
+            entries = list(self.entries)
+        start = entries[0]
+        for entry in entries:
+            if entry[2] is not None and entry[2] >= ts:
+                break
+            start = entry
+        return start[0], start[1]
+
+
+class LogIndexer:
+    """Keep a LogIndex for every bot stdout/stderr log in a directory."""
+
+    def __init__(self, log_dir, index_dir):
+        self.log_dir = Path(log_dir)
+        self.index_dir = Path(index_dir)
+        self.indexes = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        log_path = self.log_dir / name
+        if not is_indexed_log(name) or not log_path.exists():
+            return None
+        with self._lock:
+            index = self.indexes.get(name)
+            if index is None:
+                self.index_dir.mkdir(parents=True, exist_ok=True)
+                index = self.indexes[name] = LogIndex(log_path, self.index_dir / f"{name}.idx")
+        index.update()
+        return index
+
+    def update_all(self):
+        names = {path.name for path in self.log_dir.glob("*.log") if is_indexed_log(path.name)}
+        for name in sorted(names):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Error indexing {name}: {e}")
+        # Drop indexes whose log is gone
+        with self._lock:
+            for name in set(self.indexes) - names:
+                del self.indexes[name]
+        for idx in self.index_dir.glob("*.idx"):
+            if idx.name[:-len('.idx')] not in names:
+                idx.unlink(missing_ok=True)
+
+
+def read_page(index, start_line, start_offset, page, page_size, since=None, until=None):
+    """Return (first_line, lines, has_more) for one page of a window of the indexed log.
+
+    The window starts at the first line stamped at or after `since` (or at start_line)
+    and ends before the first line stamped after `until`. Lines without a timestamp belong
+    to the stamped line above them. Seeks via the index instead of reading from the top.
+    """
+    path = index.log_path
+    line_no, offset = start_line, start_offset
+    with path.open('rb') as fh:
+        fh.seek(offset)
+        if since is not None:
+            # Walk forward to the first line of the window
+            while True:
+                raw = fh.readline()
+                if not raw or not raw.endswith(b'\n'):
+                    return line_no, [], False
+                stamp = line_timestamp(raw)
+                if stamp is not None and stamp >= since:
+                    break
+                line_no += 1
+                offset += len(raw)
+            fh.seek(offset)
+        window_start = line_no
+
+        target = window_start + page * page_size
+        if target - line_no >= INDEX_STRIDE:
+            line_no, offset = index.seek_line(target)
+            fh.seek(offset)
+        result = []
+        while True:
+            raw = fh.readline()
+            if not raw or not raw.endswith(b'\n'):
+                return target, result, False
+            stamp = line_timestamp(raw)
+            if until is not None and stamp is not None and stamp > until:
+                return target, result, False
+            if line_no >= target:
+                if len(result) == page_size:
+                    return target, result, True
+                result.append({"line": line_no + 1, "text": raw[:-1].decode('utf-8', errors='replace')})
+            line_no += 1
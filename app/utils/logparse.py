@@ -0,0 +1,105 @@
+import re
+import time
+from collections import deque
+
+SEVERITY_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+_SEVERITY_RE = re.compile(r'\b(DEBUG|INFO|WARN(?:ING)?|ERROR|CRITICAL|FATAL)\b|^Traceback \(most recent call last\)')
+_SEVERITY_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}
+
+_TRACEBACK_START = "Traceback (most recent call last):"
+# Final line of a traceback: "ValueError: msg", "pkg.errors.Timeout", "KeyboardInterrupt"
+_EXCEPTION_RE = re.compile(r'^([A-Za-z_][\w.]*)(?::\s|:?\s*$)')
+# Python logging's default asctime, optionally bracketed: "2024-01-01 12:00:00,123"
+_TIMESTAMP_RE = re.compile(r'^\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})')
+
+WINDOW_SECONDS = 60
+
+
+def level_from_name(name):
+    """Map 'warn', 'ERROR', ... to a numeric level; raises ValueError for unknown names."""
+    level = name.upper()
+    level = _SEVERITY_ALIASES.get(level, level)
+    if level not in SEVERITY_LEVELS:
+        raise ValueError(f"level must be one of {', '.join(SEVERITY_LEVELS)}")
+    return SEVERITY_LEVELS[level]
+
+
+def line_severity(line):
+    """Return the numeric level named in a log line, or None if it names none."""
+    match = _SEVERITY_RE.search(line)
+    if not match:
+        return None
+    if match.group(1) is None:
+        return SEVERITY_LEVELS["ERROR"]
+    word = match.group(1)
+    return SEVERITY_LEVELS[_SEVERITY_ALIASES.get(word, word)]
+
+
+class LineParser:
+    """Incremental parser for one log file: logging levels, timestamps and tracebacks.
+
+    Holds only the state a traceback needs to span lines, so it can follow a file
+    chunk by chunk as the tailer reads it.
+    """
+
+    def __init__(self):
+        self.in_traceback = False
+        self.last_timestamp = None
+
+    def feed(self, line):
+        """Parse one line; return (level, traceback_started, exception_type)."""
+        stamp = _TIMESTAMP_RE.match(line)
+        if stamp:
+            self.last_timestamp = stamp.group(1).replace(' ', 'T')
+
+        if line.startswith(_TRACEBACK_START):
+            self.in_traceback = True
+            return SEVERITY_LEVELS["ERROR"], True, None
+        if self.in_traceback:
+            if line[:1] in (' ', '\t') or not line.strip():
+                return None, False, None  # frame lines and source excerpts
+            self.in_traceback = False
+            match = _EXCEPTION_RE.match(line)
+            if match:
+                return SEVERITY_LEVELS["ERROR"], False, match.group(1)
+        return line_severity(line), False, None
+
+
+class ErrorCounters:
+    """Rolling per-minute error and traceback counts for one bot, in one-second buckets."""
+
+    def __init__(self):
+        self.errors = deque(maxlen=WINDOW_SECONDS - 1)
+        self.tracebacks = deque(maxlen=WINDOW_SECONDS - 1)
+        self.current_errors = 0
+        self.current_tracebacks = 0
+        self.last_exception = None
+        self.last_error_at = None
+
+    def record(self, level, traceback_started, exception_type, parser):
+        # A traceback's closing exception line is part of the traceback, not another error
+        if traceback_started:
+            self.current_tracebacks += 1
+        elif exception_type:
+            self.last_exception = {"type": exception_type, "at": parser.last_timestamp or _local_now()}
+        elif level is not None and level >= SEVERITY_LEVELS["ERROR"]:
+            self.current_errors += 1
+            self.last_error_at = parser.last_timestamp or _local_now()
+
+    def tick(self):
+        self.errors.append(self.current_errors)
+        self.tracebacks.append(self.current_tracebacks)
+        self.current_errors = self.current_tracebacks = 0
+
+    def summary(self):
+        return {
+            "errors_per_min": sum(self.errors) + self.current_errors,
+            "tracebacks_per_min": sum(self.tracebacks) + self.current_tracebacks,
+            "last_exception": self.last_exception,
+            "last_error_at": self.last_error_at,
+        }
+
+
+def _local_now():
+    # Same clock and format as the timestamps bots write into their logs
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
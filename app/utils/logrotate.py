@@ -0,0 +1,152 @@
+import os
+import re
+import gzip
+import shutil
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Rotated supervisord segments look like bot_out.log.1, bot_err.log.3, ...
+_ROTATED_RE = re.compile(r'^(?P<bot>.+)_(?P<stream>out|err)\.log\.(?P<n>\d+)$')
+# Archived uncompressed logs are left alone until they have stopped changing for this long
+SETTLE_SECONDS = 60
+
+
+def parse_quotas(value):
+    """Parse 'bot1=50,bot2=200' (MB) into {bot: bytes}."""
+    quotas = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        bot, _, mb = item.partition('=')
+        quotas[bot.strip()] = int(mb) * 1024 * 1024
+    return quotas
+
+
+class LogRotator:
+    """Compress rotated and archived bot logs, then evict the oldest archives past the quotas.
+
+    Archives live in <log_dir>/archive/<bot>/<stream>-<timestamp>.log.gz, outside the names
+    supervisord itself rotates, so compressing never races its own backup renames.
+    """
+
+    def __init__(self, log_dir, bot_quota, global_quota, bot_quotas=None):
+        self.log_dir = Path(log_dir)
+        self.archive_dir = self.log_dir / "archive"
+        self.bot_quota = bot_quota
+        self.global_quota = global_quota
+        self.bot_quotas = bot_quotas or {}
+
+    def _archive_path(self, bot, stream, mtime, suffix):
+        stamp = datetime.fromtimestamp(mtime).strftime('%Y%m%dT%H%M%S')
+        directory = self.archive_dir / bot
+        directory.mkdir(parents=True, exist_ok=True)
+        n = 0
+        while True:
+            path = directory / f"{stream}-{stamp}{f'-{n}' if n else ''}{suffix}"
+            if not path.exists() and not path.with_name(path.name + '.gz').exists():
+                return path
+            n += 1
+
+    def archive(self, bot):
+        """Move a bot's live logs into its archive instead of deleting them (e.g. on restart).
+
+        The rename is atomic; a still-running process keeps appending to the archived file
+        until it is stopped, and compression waits until the file has settled.
+        """
+        for stream in ('out', 'err'):
+            live = self.log_dir / f"{bot}_{stream}.log"
+            try:
+                st = live.stat()
+            except FileNotFoundError:
+                continue
+            if st.st_size == 0:
+                continue
+            target = self._archive_path(bot, stream, st.st_mtime, '.log')
+            os.replace(live, target)
+            logger.info(f"Archived {live.name} to {target}")
+
+    def compress_rotated(self):
+        """Compress supervisord's numbered backups into the archive."""
+        for path in sorted(self.log_dir.iterdir()):
+            match = _ROTATED_RE.match(path.name)
+            if match:
+                self._compress(path, self._archive_path(
+                    match['bot'], match['stream'], path.stat().st_mtime, '.log.gz'))
+
+    def compress_archived(self):
+        """Compress logs archived on restart once nothing writes to them anymore."""
+        now = time.time()
+        for path in self.archive_dir.glob("*/*.log"):
+            if now - path.stat().st_mtime >= SETTLE_SECONDS:
+                self._compress(path, path.with_name(path.name + '.gz'))
+
+    def _compress(self, path, target):
+        tmp = target.with_name(target.name + '.tmp')
+        with path.open('rb') as src:
+            inode = os.fstat(src.fileno()).st_ino
+            mtime = os.fstat(src.fileno()).st_mtime
+            with gzip.open(tmp, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.utime(tmp, (mtime, mtime))
+        os.replace(tmp, target)
+        # supervisord may have shifted the backup to .N+1 meanwhile; remove it by inode, not by name
+        for candidate in [path] + sorted(path.parent.glob(path.name.rsplit('.', 1)[0] + '.*')):
+            try:
+                if candidate.stat().st_ino == inode:
+                    candidate.unlink()
+                    break
+            except FileNotFoundError:
+                continue
+        logger.info(f"Compressed {path.name} to {target}")
+
+    def _archives(self):
+        """All archive segments as (mtime, size, bot, path), oldest first."""
+        segments = []
+        for path in self.archive_dir.glob("*/*.gz"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            segments.append((st.st_mtime, st.st_size, path.parent.name, path))
+        return sorted(segments)
+
+    def _live_size(self, bot):
+        total = 0
+        for stream in ('out', 'err'):
+            try:
+                total += (self.log_dir / f"{bot}_{stream}.log").stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def enforce_quotas(self):
+        """Evict the oldest compressed segments until every bot and the whole fleet fit."""
+        segments = self._archives()
+        usage = {}
+        for _, size, bot, _ in segments:
+            usage[bot] = usage.get(bot, 0) + size
+        for bot in usage:
+            usage[bot] += self._live_size(bot)
+        total = sum(size for _, size, _, _ in segments)
+
+        for _, size, bot, path in segments:
+            over_bot = usage[bot] > self.bot_quotas.get(bot, self.bot_quota)
+            over_global = total > self.global_quota
+            if not (over_bot or over_global):
+                continue
+            path.unlink(missing_ok=True)
+            usage[bot] -= size
+            total -= size
+            logger.info(f"Evicted log archive {path} ({'bot quota' if over_bot else 'global cap'})")
+
+        for directory in self.archive_dir.glob("*"):
+            if directory.is_dir() and not any(directory.iterdir()):
+                directory.rmdir()
+
+    def run_once(self):
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.compress_rotated()
+        self.compress_archived()
+        self.enforce_quotas()
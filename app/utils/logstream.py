@@ -0,0 +1,597 @@
+import os
+import re
+import time
+import queue
+import logging
+import secrets
+import threading
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+import eventlet
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+from app.utils.logparse import (
+    SEVERITY_LEVELS, level_from_name, line_severity, LineParser, ErrorCounters
+)
+
+logger = logging.getLogger(__name__)
+
+RING_BUFFER_CHUNKS = 2000
+SUBSCRIBER_QUEUE_SIZE = 500
+SEED_TAIL_BYTES = 8 * 1024
+# The tailer runs on the hub: it reads and collapses READ_CHUNK_BYTES at a time, yielding in
+# between, and moves on to the next file after MAX_READ_BYTES so one noisy bot cannot starve the rest
+READ_CHUNK_BYTES = 64 * 1024
+MAX_READ_BYTES = 1024 * 1024
+MAX_PARTIAL_LINE_BYTES = 64 * 1024
+RESUME_MAX_BYTES = 4 * 1024 * 1024
+# Catch-up chunk size; a resume cursor advances per chunk, so a reconnect repeats at most this much
+RESUME_READ_BYTES = 64 * 1024
+MAX_ROTATED_BACKUPS = 10
+# Resume cursors kept per stream, and how many closed streams stay resumable and for how long
+CURSOR_HISTORY = 32
+CURSOR_MAX_STREAMS = 200
+CURSOR_TTL = 300
+# Repeat summaries and rate windows close once per tick
+TICK_SECONDS = 1.0
+RATE_SMOOTHING = 0.3
+
+# Numbers, hex ids and the like differ between otherwise identical spam lines
+_VOLATILE_RE = re.compile(r'0x[0-9a-fA-F]+|[0-9a-fA-F]{8,}|\d+(?:[.:,]\d+)*')
+
+
+def is_stream_log(path):
+    name = os.path.basename(path)
+    return name.endswith('.log') and '_combined' not in name
+
+
+def split_log_name(name):
+    """Map 'bot_out.log' to ('bot', 'out'); files that are not bot logs get stream None."""
+    for stream in ('out', 'err'):
+        suffix = f"_{stream}.log"
+        if name.endswith(suffix):
+            return name[:-len(suffix)], stream
+    return name[:-len('.log')] if name.endswith('.log') else name, None
+
+
+def line_signature(line):
+    """Key under which near-identical lines (differing only in numbers/ids) collapse."""
+    return _VOLATILE_RE.sub('#', line).strip()
+
+
+class LogFilter:
+    """Per-subscriber selection of bots, stream, text pattern and minimum severity."""
+
+    def __init__(self, bots=None, stream=None, pattern=None, min_level=None):
+        self.bots = set(bots) if bots else None
+        self.stream = stream
+        self.pattern = pattern
+        self.min_level = min_level
+        # Lines without a level (traceback bodies, wrapped messages) inherit the previous line's level
+        self._last_level = {}
+
+    @classmethod
+    def from_args(cls, args):
+        """Build a filter from query parameters; raises ValueError on bad input."""
+        bots = [b.strip() for value in args.getlist('bots') for b in value.split(',') if b.strip()]
+        stream = args.get('stream') or None
+        if stream not in (None, 'out', 'err'):
+            raise ValueError("stream must be 'out' or 'err'")
+        pattern = None
+        if args.get('regex'):
+            try:
+                pattern = re.compile(args['regex'])
+            except re.error as e:
+                raise ValueError(f"Invalid regex: {e}")
+        elif args.get('q'):
+            pattern = re.compile(re.escape(args['q']), re.IGNORECASE)
+        min_level = None
+        if args.get('level'):
+            min_level = level_from_name(args['level'])
+        return cls(bots, stream, pattern, min_level)
+
+    @property
+    def selects_lines(self):
+        return self.pattern is not None or self.min_level is not None
+
+    def matches_file(self, name):
+        bot, stream = split_log_name(name)
+        if self.bots is not None and bot not in self.bots:
+            return False
+        return self.stream is None or stream == self.stream
+
+    def apply(self, chunk):
+        """Return the part of a chunk's text this subscriber wants, or '' for none of it."""
+        if not self.matches_file(chunk["file"]):
+            return ''
+        if not self.selects_lines:
+            return chunk["data"]
+        kept = []
+        level = self._last_level.get(chunk["file"], SEVERITY_LEVELS["INFO"])
+        for line in chunk["data"].splitlines(keepends=True):
+            if self.min_level is not None:
+                found = line_severity(line)
+                if found is not None:
+                    level = found
+                if level < self.min_level:
+                    continue
+            if self.pattern is not None and not self.pattern.search(line):
+                continue
+            kept.append(line)
+        self._last_level[chunk["file"]] = level
+        return ''.join(kept)
+
+
+class FrameBatcher:
+    """Group filtered log text into frames flushed by age or size, whichever comes first."""
+
+    def __init__(self, flush_interval, max_size):
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.entries = []
+        self.size = 0
+        self.deadline = None
+
+    def add(self, name, text):
+        """Queue text for a file and return any frames that became full."""
+        frames = []
+        for piece in self._pieces(text):
+            if self.entries and self.size + len(piece) > self.max_size:
+                frames.append(self.flush())
+            if self.deadline is None:
+                self.deadline = time.monotonic() + self.flush_interval
+            if self.entries and self.entries[-1]["file"] == name:
+                self.entries[-1]["data"] += piece
+            else:
+                self.entries.append({"file": name, "data": piece})
+            self.size += len(piece)
+        return frames
+
+    def _pieces(self, text):
+        """Split text at line boundaries so no piece exceeds max_size unless one line does."""
+        if len(text) <= self.max_size:
+            yield text
+            return
+        piece = ''
+        for line in text.splitlines(keepends=True):
+            if piece and len(piece) + len(line) > self.max_size:
+                yield piece
+                piece = ''
+            piece += line
+        if piece:
+            yield piece
+
+    def time_left(self):
+        """Seconds until the pending frame is due, or None if nothing is pending."""
+        if self.deadline is None:
+            return None
+        return max(0, self.deadline - time.monotonic())
+
+    def flush(self):
+        frame, self.entries, self.size, self.deadline = self.entries, [], 0, None
+        return frame
+
+
+class _LogDirHandler(FileSystemEventHandler):
+    def __init__(self, tailer):
+        self.tailer = tailer
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path and is_stream_log(path):
+                self.tailer.mark_dirty(os.path.basename(path))
+
+
+class _CursorHistory:
+    __slots__ = ('seq', 'cursors', 'closed_at')
+
+    def __init__(self):
+        self.seq = 0
+        self.cursors = OrderedDict()
+        self.closed_at = None
+
+
+class CursorStore:
+    """Short SSE event ids for resume cursors ({file: (inode, offset)}).
+
+    A full cursor names every log file and soon outgrows a URL, so each stream gets a
+    random key and its ids are "key.seq". The last `history` cursors of a stream are kept,
+    letting a client that missed a few in-flight frames resume from the one it did get;
+    a closed stream is forgotten after `ttl` seconds, or sooner beyond `max_streams`.
+    """
+
+    def __init__(self, history=CURSOR_HISTORY, max_streams=CURSOR_MAX_STREAMS, ttl=CURSOR_TTL):
+        self.history = history
+        self.max_streams = max_streams
+        self.ttl = ttl
+        self.streams = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stream(self):
+        """Key of a new stream, kept resumable for `ttl` seconds after the block exits."""
+        key = secrets.token_hex(6)
+        with self._lock:
+            self._prune()
+            self.streams[key] = _CursorHistory()
+        try:
+            yield key
+        finally:
+            with self._lock:
+                self.streams[key].closed_at = time.monotonic()
+
+    def issue(self, key, cursor):
+        """Event id for a stream's current cursor; an unchanged cursor keeps its id."""
+        with self._lock:
+            stream = self.streams[key]
+            if not stream.cursors or stream.cursors[stream.seq] != cursor:
+                stream.seq += 1
+                stream.cursors[stream.seq] = dict(cursor)
+                while len(stream.cursors) > self.history:
+                    stream.cursors.popitem(last=False)
+            return f"{key}.{stream.seq}"
+
+    def resolve(self, event_id):
+        """Cursor behind an event id, or None if it is malformed, unknown or expired."""
+        key, _, seq = event_id.partition('.')
+        with self._lock:
+            stream = self.streams.get(key)
+            cursor = stream.cursors.get(int(seq)) if stream is not None and seq.isdigit() else None
+            return dict(cursor) if cursor is not None else None
+
+    def _prune(self):
+        now = time.monotonic()
+        closed = [key for key, stream in self.streams.items() if stream.closed_at is not None]
+        for key in closed:
+            if now - self.streams[key].closed_at > self.ttl or len(self.streams) >= self.max_streams:
+                del self.streams[key]
+
+
+class _FileState:
+    __slots__ = ('inode', 'position', 'partial', 'published', 'last_signature', 'repeats', 'parser')
+
+    def __init__(self, inode, position):
+        self.inode = inode
+        self.position = position
+        self.partial = b''
+        # End offset of the last byte handed to subscribers; position minus any held partial line
+        self.published = position
+        self.last_signature = None
+        self.repeats = 0
+        self.parser = LineParser()
+
+
+class _BotRate:
+    """Write-rate accounting and optional throughput ceiling for one bot's logs."""
+    __slots__ = ('lines', 'bytes', 'lines_per_sec', 'bytes_per_sec', 'allowance',
+                 'suppressed_lines', 'suppressed_bytes', 'last_file')
+
+    def __init__(self, ceiling):
+        self.lines = self.bytes = 0
+        self.lines_per_sec = self.bytes_per_sec = 0.0
+        self.allowance = ceiling
+        self.suppressed_lines = self.suppressed_bytes = 0
+        self.last_file = None
+
+
+class Subscription:
+    def __init__(self, tailer, maxsize):
+        self.tailer = tailer
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.pending = deque()
+        self.last_seq = 0
+        self.lagging = False
+        # Published offsets of every file when the subscription started, for resume cursors
+        self.start_seq = 0
+        self.positions = {}
+
+    def offer(self, chunk):
+        if self.lagging:
+            return
+        try:
+            self.queue.put_nowait(chunk)
+        except queue.Full:
+            # Never block the tailer on one slow reader; it catches up from the ring buffer instead.
+            self.lagging = True
+
+    def get(self, timeout):
+        """Return the next chunk, or None if nothing arrived within timeout."""
+        while True:
+            if self.lagging and self.queue.empty():
+                self.lagging = False
+                self.pending.extend(self.tailer.since(self.last_seq))
+            if self.pending:
+                chunk = self.pending.popleft()
+            else:
+                try:
+                    chunk = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    return None
+            if chunk["seq"] <= self.last_seq:
+                continue
+            self.last_seq = chunk["seq"]
+            return chunk
+
+
+def _repeat_record(count):
+    return f"[last message repeated {count} time{'s' if count != 1 else ''}]\n".encode()
+
+
+class LogTailer:
+    """Tail every supervisor log once and fan new chunks out to all log stream subscribers."""
+
+    def __init__(self, log_dir, buffer_chunks=RING_BUFFER_CHUNKS, queue_size=SUBSCRIBER_QUEUE_SIZE,
+                 rate_ceiling=0):
+        self.log_dir = Path(log_dir)
+        # Bytes per second each bot may send to the live stream; 0 disables the ceiling
+        self.rate_ceiling = rate_ceiling
+        self.bot_rates = {}
+        self.error_counters = {}
+        self.queue_size = queue_size
+        self.buffer = deque(maxlen=buffer_chunks)
+        self.files = {}
+        self.subscribers = set()
+        self.seq = 0
+        self._dirty = set()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._observer = None
+
+    def start(self):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self.log_dir.glob("*.log")):
+            if is_stream_log(str(path)):
+                self._seed(path)
+        self._observer = Observer()
+        self._observer.schedule(_LogDirHandler(self), str(self.log_dir), recursive=False)
+        self._observer.start()
+        logger.info(f"Log tailer watching {self.log_dir}")
+
+    def mark_dirty(self, name):
+        self._dirty.add(name)
+        self._wakeup.set()
+
+    def run(self):
+        next_tick = time.monotonic() + TICK_SECONDS
+        while True:
+            self._wakeup.wait(timeout=max(0, next_tick - time.monotonic()))
+            self._wakeup.clear()
+            dirty, self._dirty = self._dirty, set()
+            for name in sorted(dirty):
+                try:
+                    if self._read_new(self.log_dir / name):
+                        # Over this pass's budget; finish the file on the next pass
+                        self.mark_dirty(name)
+                except Exception as e:
+                    logger.error(f"Error tailing {name}: {e}")
+            if time.monotonic() >= next_tick:
+                self._tick(TICK_SECONDS)
+                next_tick = time.monotonic() + TICK_SECONDS
+
+    def _tick(self, elapsed):
+        """Close the rate window, refill ceilings and publish pending repeat/suppression summaries."""
+        for name, state in self.files.items():
+            if state.repeats:
+                self._publish(name, _repeat_record(state.repeats), state)
+                state.repeats = 0
+        for bot, rate in self.bot_rates.items():
+            rate.lines_per_sec += RATE_SMOOTHING * (rate.lines / elapsed - rate.lines_per_sec)
+            rate.bytes_per_sec += RATE_SMOOTHING * (rate.bytes / elapsed - rate.bytes_per_sec)
+            rate.lines = rate.bytes = 0
+            if rate.suppressed_lines and rate.last_file in self.files:
+                self._publish(rate.last_file, (
+                    f"[{rate.suppressed_lines} lines ({rate.suppressed_bytes} bytes) not streamed: "
+                    f"over the {self.rate_ceiling} B/s log rate ceiling]\n"
+                ).encode(), self.files[rate.last_file])
+                rate.suppressed_lines = rate.suppressed_bytes = 0
+            rate.allowance = self.rate_ceiling
+        for counters in self.error_counters.values():
+            counters.tick()
+
+    def health(self, bot=None):
+        """Rolling error and traceback counts parsed from the logs, for one bot or all of them."""
+        if bot is not None:
+            counters = self.error_counters.get(bot)
+            return counters.summary() if counters else None
+        return {bot: counters.summary() for bot, counters in self.error_counters.items()}
+
+    def rates(self):
+        """Smoothed per-bot write rates, measured on what the bots wrote rather than what was streamed."""
+        return {
+            bot: {"lines_per_sec": round(rate.lines_per_sec, 1), "bytes_per_sec": round(rate.bytes_per_sec)}
+            for bot, rate in self.bot_rates.items()
+        }
+
+    def _seed(self, path):
+        """Start at the end of an existing file, keeping its last few lines as backlog."""
+        st = path.stat()
+        start = max(0, st.st_size - SEED_TAIL_BYTES)
+        with path.open('rb') as fh:
+            fh.seek(start)
+            data = fh.read(st.st_size - start)
+        if start:
+            data = data.split(b'\n', 1)[1] if b'\n' in data else b''
+        state = self.files[path.name] = _FileState(st.st_ino, st.st_size)
+        if data.strip():
+            self._publish(path.name, data, state)
+
+    def _read_new(self, path):
+        """Read and publish what was appended to a file; True if it stopped at MAX_READ_BYTES."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self.files.pop(path.name, None)
+            return False
+        state = self.files.get(path.name)
+        if state is None or state.inode != st.st_ino or st.st_size < state.position:
+            # New, rotated or truncated file: start from the beginning
+            state = self.files[path.name] = _FileState(st.st_ino, 0)
+        if st.st_size == state.position:
+            return False
+        budget = MAX_READ_BYTES
+        with path.open('rb') as fh:
+            fh.seek(state.position)
+            while True:
+                if budget <= 0:
+                    return True
+                data = fh.read(READ_CHUNK_BYTES)
+                if not data:
+                    return False
+                budget -= len(data)
+                state.position += len(data)
+                data = state.partial + data
+                cut = data.rfind(b'\n') + 1
+                if cut == 0 and len(data) < MAX_PARTIAL_LINE_BYTES:
+                    state.partial = data
+                    continue
+                if cut == 0:
+                    cut = len(data)
+                state.partial = data[cut:]
+                self._collapse(path.name, data[:cut], state)
+                # Let stream, socket and request greenlets run between chunks of a burst
+                eventlet.sleep(0)
+
+    def _collapse(self, name, data, state):
+        """Streaming spam filter between the file and subscribers.
+
+        Runs of identical or near-identical lines become one line plus a
+        "last message repeated N times" record, and lines over the bot's rate
+        ceiling are counted instead of streamed. Every line, repeated or not,
+        also goes through the file's parser to feed the bot's error counters.
+        """
+        bot, _ = split_log_name(name)
+        rate = self.bot_rates.get(bot)
+        if rate is None:
+            rate = self.bot_rates[bot] = _BotRate(self.rate_ceiling)
+        rate.last_file = name
+        rate.lines += data.count(b'\n')
+        rate.bytes += len(data)
+        counters = self.error_counters.get(bot)
+        if counters is None:
+            counters = self.error_counters[bot] = ErrorCounters()
+
+        kept = []
+        for line in data.splitlines(keepends=True):
+            text = line.decode('utf-8', errors='replace')
+            # Parse before collapsing so a storm of repeated errors still counts in full
+            counters.record(*state.parser.feed(text), state.parser)
+            if not line.strip():
+                continue
+            signature = line_signature(text)
+            if signature == state.last_signature:
+                state.repeats += 1
+                continue
+            if state.repeats:
+                kept.append(_repeat_record(state.repeats))
+                state.repeats = 0
+            state.last_signature = signature
+            if self.rate_ceiling:
+                if rate.allowance < len(line):
+                    rate.suppressed_lines += 1
+                    rate.suppressed_bytes += len(line)
+                    continue
+                rate.allowance -= len(line)
+            kept.append(line)
+        if kept:
+            self._publish(name, b''.join(kept), state)
+
+    def _publish(self, name, data, state):
+        with self._lock:
+            self.seq += 1
+            state.published = state.position - len(state.partial)
+            chunk = {
+                "seq": self.seq,
+                "file": name,
+                "inode": state.inode,
+                "end": state.published,
+                "data": data.decode('utf-8', errors='replace'),
+            }
+            self.buffer.append(chunk)
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.offer(chunk)
+
+    def since(self, seq):
+        with self._lock:
+            return [chunk for chunk in self.buffer if chunk["seq"] > seq]
+
+    def catch_up(self, cursor, positions):
+        """Yield chunks covering what a client missed between its cursor and a subscription's start.
+
+        Follows a file into its supervisord backup (name.1, name.2, ...) if it was rotated
+        in between, and never reads more than RESUME_MAX_BYTES per file.
+        """
+        for name, (inode, offset) in sorted(cursor.items()):
+            current_inode, until = positions.get(name, (None, 0))
+            if inode != current_inode:
+                rotated = self._find_rotated(name, inode)
+                if rotated is not None:
+                    yield from self._read_range(rotated, name, inode, offset, None)
+                offset = 0
+            if current_inode is not None:
+                yield from self._read_range(self.log_dir / name, name, current_inode, offset, until)
+
+    def _find_rotated(self, name, inode):
+        for i in range(1, MAX_ROTATED_BACKUPS + 1):
+            path = self.log_dir / f"{name}.{i}"
+            try:
+                if path.stat().st_ino == inode:
+                    return path
+            except FileNotFoundError:
+                break
+        return None
+
+    def _read_range(self, path, name, inode, offset, until):
+        try:
+            with path.open('rb') as fh:
+                if until is None:
+                    until = os.fstat(fh.fileno()).st_size
+                if offset > until:
+                    offset = 0  # truncated since the cursor was issued
+                skip_partial = until - offset > RESUME_MAX_BYTES
+                if skip_partial:
+                    offset = until - RESUME_MAX_BYTES
+                fh.seek(offset)
+                while offset < until:
+                    data = fh.read(min(RESUME_READ_BYTES, until - offset))
+                    if not data:
+                        break
+                    if skip_partial:
+                        # Started mid-file to stay within the limit: drop the cut-off first line
+                        skip_partial = False
+                        cut = data.find(b'\n') + 1
+                        offset += cut
+                        data = data[cut:]
+                    if data and offset + len(data) < until and b'\n' in data:
+                        data = data[:data.rfind(b'\n') + 1]
+                    fh.seek(offset + len(data))
+                    offset += len(data)
+                    if data.strip():
+                        yield {"file": name, "inode": inode, "end": offset,
+                               "data": data.decode('utf-8', errors='replace')}
+        except FileNotFoundError:
+            return
+
+    @contextmanager
+    def subscribe(self, backlog=True):
+        """Register a subscriber, pre-filled with the ring buffer unless backlog is False."""
+        subscription = Subscription(self, self.queue_size)
+        with self._lock:
+            if backlog:
+                for chunk in self.buffer:
+                    subscription.offer(chunk)
+            subscription.start_seq = self.seq
+            if not backlog:
+                subscription.last_seq = self.seq
+            subscription.positions = {name: (state.inode, state.published) for name, state in self.files.items()}
+            self.subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self.subscribers.discard(subscription)
@@ -14,7 +14,7 @@ def run_supervisord():
     subprocess.run(["supervisord", "-n", "-c", "supervisord.conf"])
 
 def run_worker():
-    subprocess.run(["python3", "worker.py"])
+    subprocess.run(["python3", "worker.py", "--daemon"])
 
 def run_ping_server():
     subprocess.run(["python3", "ping_server.py"])
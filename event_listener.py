@@ -0,0 +1,45 @@
+import os
+import sys
+import json
+import time
+import socket
+from supervisor import childutils
+
+EVENT_SOCKET = os.getenv("SUPERVISOR_EVENT_SOCKET", "/tmp/botclusters-events.sock")
+
+
+def log(message):
+    # stdout belongs to the supervisord event protocol, so diagnostics go to stderr.
+    sys.stderr.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {message}\n")
+    sys.stderr.flush()
+
+
+def forward(sock, headers, payload):
+    event_headers, _ = childutils.eventdata(payload + '\n')
+    message = {
+        "name": event_headers["processname"],
+        "group": event_headers["groupname"],
+        "from_state": event_headers.get("from_state"),
+        "state": headers["eventname"][len("PROCESS_STATE_"):],
+        "pid": event_headers.get("pid"),
+        "timestamp": time.time(),
+    }
+    try:
+        sock.sendto(json.dumps(message).encode(), EVENT_SOCKET)
+    except OSError as e:
+        # The dashboard may not be up yet; state events are advisory, so drop them.
+        log(f"Could not forward {message['name']} -> {message['state']}: {e}")
+
+
+def main():
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    while True:
+        headers, payload = childutils.listener.wait(sys.stdin, sys.stdout)
+        if headers["eventname"].startswith("PROCESS_STATE_"):
+            forward(sock, headers, payload)
+        childutils.listener.ok(sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
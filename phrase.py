@@ -1,5 +1,5 @@
-WORD_LIST = [
-    "bright", "silent", "quick", "clever", "swift", 
+WORD_LIST = (
+    "bright", "silent", "quick", "clever", "swift",
     "brave", "happy", "wise", "gentle", "bold",
     "calm", "crisp", "fierce", "soft", "lively",
     "dark", "light", "rich", "pure", "smooth",
@@ -8,311 +8,50 @@ WORD_LIST = [
     "tough", "loyal", "daring", "funny", "quiet",
     "zesty", "spicy", "tender", "brisk", "lofty",
     "graceful", "mellow", "bouncy", "chill", "eager",
-    "bold", "clear", "sneaky", "sparkly", "fuzzy",
-    "rustic", "genuine", "witty", "jolly", "friendly",
-    "fearless", "energetic", "cheerful", "serene", "carefree",
-    "faithful", "playful", "sassy", "creative", "adventurous",
-    "original", "whimsical", "thoughtful", "reliable", "radiant",
-    "peaceful", "vibrant", "artistic", "elegant", "dynamic",
-    "enthusiastic", "positive", "imaginative", "intuitive", "charming",
-    "wonderful", "spectacular", "fabulous", "magnificent", "incredible",
-    "extraordinary", "breathtaking", "delightful", "stunning", "fascinating",
-    "enchanting", "captivating", "alluring", "inviting", "enticing",
-    "engaging", "remarkable", "extraordinary", "unforgettable", "heartfelt",
-    "vital", "unique", "distinct", "inspiring", "motivating",
-    "comforting", "uplifting", "rejuvenating", "refreshing", "energizing",
-    "empowering", "affirmative", "transformative", "groundbreaking", "visionary",
-    "striking", "remarkable", "astounding", "startling", "surprising",
-    "shocking", "amazing", "awesome", "fantastic", "wonderful",
-    "brilliant", "exceptional", "noteworthy", "prominent", "celebrated",
-    "acclaimed", "distinguished", "renowned", "prestigious", "illustrious",
-    "esteemed", "reputable", "highly regarded", "admired", "respected",
-    "lauded", "exalted", "famed", "notable", "legendary",
-    "iconic", "mythical", "epic", "heroic", "legendary",
+    "clear", "sneaky", "sparkly", "fuzzy", "rustic",
+    "genuine", "witty", "jolly", "friendly", "fearless",
+    "energetic", "cheerful", "serene", "carefree", "faithful",
+    "playful", "sassy", "creative", "adventurous", "original",
+    "whimsical", "thoughtful", "reliable", "radiant", "peaceful",
+    "vibrant", "artistic", "elegant", "dynamic", "enthusiastic",
+    "positive", "imaginative", "intuitive", "charming", "wonderful",
+    "spectacular", "fabulous", "magnificent", "incredible", "extraordinary",
+    "breathtaking", "delightful", "stunning", "fascinating", "enchanting",
+    "captivating", "alluring", "inviting", "enticing", "engaging",
+    "remarkable", "unforgettable", "heartfelt", "vital", "unique",
+    "distinct", "inspiring", "motivating", "comforting", "uplifting",
+    "rejuvenating", "refreshing", "energizing", "empowering", "affirmative",
+    "transformative", "groundbreaking", "visionary", "striking", "astounding",
+    "startling", "surprising", "shocking", "amazing", "awesome",
+    "fantastic", "brilliant", "exceptional", "noteworthy", "prominent",
+    "celebrated", "acclaimed", "distinguished", "renowned", "prestigious",
+    "illustrious", "esteemed", "reputable", "regarded", "admired",
+    "respected", "lauded", "exalted", "famed", "notable",
+    "legendary", "iconic", "mythical", "epic", "heroic",
     "timeless", "classic", "ageless", "evergreen", "perennial",
     "lasting", "enduring", "eternal", "infinite", "boundless",
     "limitless", "immense", "gigantic", "vast", "huge",
     "colossal", "enormous", "tremendous", "massive", "grand",
     "majestic", "stately", "noble", "regal", "imperial",
-    "lofty", "towering", "elevated", "high", "uplifted",
-    "inspiring", "exhilarating", "thrilling", "invigorating", "breathtaking",
-    "astonishing", "stupendous", "superb", "splendid", "magnificent",
-    "impressive", "extraordinary", "remarkable", "unusual", "outstanding",
-    "exceptional", "noteworthy", "extraordinary", "peculiar", "curious",
-    "strange", "uncommon", "rare", "singular", "unconventional",
-    "different", "unique", "special", "distinctive", "individual",
+    "towering", "elevated", "high", "uplifted", "exhilarating",
+    "thrilling", "invigorating", "astonishing", "stupendous", "superb",
+    "splendid", "impressive", "unusual", "outstanding", "peculiar",
+    "curious", "strange", "uncommon", "rare", "singular",
+    "unconventional", "different", "special", "distinctive", "individual",
     "personal", "characteristic", "typical", "ordinary", "common",
     "mundane", "average", "standard", "regular", "routine",
     "usual", "expected", "predictable", "familiar", "recognizable",
     "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",
-    "superior", "prime", "top-notch", "first-rate", "premium",
-    "exquisite", "fine", "delicate", "subtle", "intricate",
-    "nuanced", "complex", "layered", "rich", "deep",
-    "profound", "thoughtful", "insightful", "perceptive", "intelligent",
-    "smart", "wise", "knowledgeable", "informed", "learned",
-    "educated", "sagacious", "astute", "shrewd", "clever",
-    "brilliant", "bright", "genius", "exceptional", "gifted",
-    "talented", "skilled", "proficient", "adept", "capable",
-    "competent", "efficient", "effective", "resourceful", "ingenious",
-    "inventive", "creative", "artistic", "imaginative", "innovative",
-    "original", "unique", "uncommon", "unusual", "distinct",
-    "singular", "individual", "personal", "characteristic", "typical",
-    "ordinary", "common", "standard", "regular", "routine",
-    "usual", "expected", "predictable", "familiar", "recognizable",
-    "well-known", "popular", "trendy", "fashionable", "stylish",
-    "chic", "elegant", "sophisticated", "tasteful", "cultured",
-    "refined", "classy", "polished", "glamorous", "opulent",
-    "luxurious", "lavish", "extravagant", "sumptuous", "ritzy",
-    "posh", "fancy", "exclusive", "high-end", "elite",]
-  
+    "chic", "sophisticated", "tasteful", "cultured", "refined",
+    "classy", "polished", "glamorous", "opulent", "luxurious",
+    "lavish", "extravagant", "sumptuous", "ritzy", "posh",
+    "fancy", "exclusive", "high-end", "elite", "superior",
+    "prime", "top-notch", "first-rate", "premium", "exquisite",
+    "fine", "delicate", "subtle", "intricate", "nuanced",
+    "complex", "layered", "deep", "profound", "insightful",
+    "perceptive", "intelligent", "smart", "knowledgeable", "informed",
+    "learned", "educated", "sagacious", "astute", "shrewd",
+    "genius", "gifted", "talented", "skilled", "proficient",
+    "adept", "capable", "competent", "efficient", "effective",
+    "resourceful", "ingenious", "inventive", "innovative",
+)
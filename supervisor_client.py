@@ -0,0 +1,169 @@
+import os
+import queue
+import socket
+import logging
+import xmlrpc.client
+from contextlib import contextmanager
+from supervisor.xmlrpc import Faults, SupervisorTransport
+
+SUPERVISOR_SERVER_URL = os.getenv("SUPERVISOR_SERVER_URL", "unix:///var/run/supervisor.sock")
+SUPERVISOR_USERNAME = os.getenv("SUPERVISOR_USERNAME")
+SUPERVISOR_PASSWORD = os.getenv("SUPERVISOR_PASSWORD")
+SUPERVISOR_POOL_SIZE = int(os.getenv("SUPERVISOR_POOL_SIZE", 4))
+# Name of the [eventlistener] in supervisord.conf; it is infrastructure, not a bot.
+EVENT_LISTENER_NAME = "process_state_listener"
+
+logger = logging.getLogger(__name__)
+
+Fault = xmlrpc.client.Fault
+
+
+class SupervisorClient:
+    """Pooled XML-RPC client for supervisord's rpcinterface, shared by the worker and the dashboard."""
+
+    def __init__(self, serverurl=SUPERVISOR_SERVER_URL, username=SUPERVISOR_USERNAME,
+                 password=SUPERVISOR_PASSWORD, pool_size=SUPERVISOR_POOL_SIZE):
+        self.serverurl = serverurl
+        self.username = username
+        self.password = password
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _new_proxy(self):
+        transport = SupervisorTransport(self.username, self.password, self.serverurl)
+        return xmlrpc.client.ServerProxy("http://127.0.0.1", transport=transport)
+
+    @contextmanager
+    def _proxy(self):
+        try:
+            proxy = self._pool.get_nowait()
+        except queue.Empty:
+            proxy = self._new_proxy()
+        try:
+            yield proxy
+        except (OSError, socket.error, xmlrpc.client.ProtocolError):
+            # Drop the broken connection instead of returning it to the pool.
+            proxy("transport").close()
+            raise
+        except Fault:
+            # A fault is a complete response; the connection is still good.
+            self._release(proxy)
+            raise
+        except BaseException:
+            # Anything else may have left a half-read response on the connection.
+            proxy("transport").close()
+            raise
+        self._release(proxy)
+
+    def _release(self, proxy):
+        try:
+            self._pool.put_nowait(proxy)
+        except queue.Full:
+            proxy("transport").close()
+
+    def call(self, method, *args):
+        for attempt in range(2):
+            try:
+                with self._proxy() as proxy:
+                    func = proxy
+                    for part in method.split('.'):
+                        func = getattr(func, part)
+                    return func(*args)
+            except (OSError, socket.error, xmlrpc.client.ProtocolError):
+                if attempt:
+                    raise
+                logger.warning(f"Supervisor connection lost during {method}, reconnecting")
+
+    def multicall(self, calls):
+        """Run [(method, args), ...] in one round trip. Faults come back as dicts, not exceptions."""
+        if not calls:
+            return []
+        payload = [{"methodName": method, "params": list(args)} for method, args in calls]
+        return self.call("system.multicall", payload)
+
+    def get_all_process_info(self):
+        return self.call("supervisor.getAllProcessInfo")
+
+    def get_process_info(self, name):
+        """Return the process info dict, or None if supervisord does not know the process."""
+        try:
+            return self.call("supervisor.getProcessInfo", name)
+        except Fault as e:
+            if e.faultCode == Faults.BAD_NAME:
+                return None
+            raise
+
+    def start_process(self, name, wait=True):
+        return self.call("supervisor.startProcess", name, wait)
+
+    def stop_process(self, name, wait=True):
+        return self.call("supervisor.stopProcess", name, wait)
+
+    def stop_processes(self, names, wait=True):
+        return self.multicall([("supervisor.stopProcess", (name, wait)) for name in names])
+
+    def restart_all(self):
+        return self.multicall([
+            ("supervisor.stopAllProcesses", (True,)),
+            ("supervisor.startAllProcesses", (True,)),
+        ])
+
+    def add_programs(self, names, reload=None):
+        """Register programs with addProcessGroup from supervisord's already-parsed config.
+
+        Only programs it has no config for (conf written or restored since the last reload)
+        cost a reloadConfig, and those share a single one made through `reload` (default
+        self.update). Returns the names that needed it.
+        """
+        results = self.multicall([("supervisor.addProcessGroup", (name,)) for name in names])
+        missing = []
+        for name, result in zip(names, results):
+            if not isinstance(result, dict) or "faultCode" not in result:
+                continue
+            if result["faultCode"] == Faults.BAD_NAME:
+                missing.append(name)
+            elif result["faultCode"] != Faults.ALREADY_ADDED:
+                logger.warning(f"addProcessGroup({name}) failed: {result['faultString']}")
+        if missing:
+            (reload or self.update)(missing)
+        return missing
+
+    def remove_programs(self, names):
+        """Stop and unregister programs without re-reading any configuration."""
+        calls = []
+        for name in names:
+            calls += [("supervisor.stopProcessGroup", (name, True)), ("supervisor.removeProcessGroup", (name,))]
+        for (method, args), result in zip(calls, self.multicall(calls)):
+            if isinstance(result, dict) and result.get("faultCode") not in (None, Faults.BAD_NAME, Faults.NOT_RUNNING):
+                logger.warning(f"{method}{args} failed: {result['faultString']}")
+
+    def update(self, names=None):
+        """Equivalent of `supervisorctl update [names]`: reload config and apply group changes in one multicall."""
+        added, changed, removed = self.call("supervisor.reloadConfig")[0]
+        if names is not None:
+            names = set(names)
+            added = [n for n in added if n in names]
+            changed = [n for n in changed if n in names]
+            removed = [n for n in removed if n in names]
+
+        calls = []
+        for name in removed:
+            calls += [("supervisor.stopProcessGroup", (name,)), ("supervisor.removeProcessGroup", (name,))]
+        for name in changed:
+            calls += [("supervisor.stopProcessGroup", (name,)), ("supervisor.removeProcessGroup", (name,)),
+                      ("supervisor.addProcessGroup", (name,))]
+        for name in added:
+            calls.append(("supervisor.addProcessGroup", (name,)))
+
+        for (method, args), result in zip(calls, self.multicall(calls)):
+            if isinstance(result, dict) and "faultCode" in result:
+                logger.warning(f"{method}{args} failed: {result['faultString']}")
+        return {"added": added, "changed": changed, "removed": removed}
+
+
+def process_name(info):
+    if info["group"] == info["name"]:
+        return info["name"]
+    return f"{info['group']}:{info['name']}"
+
+
+supervisor = SupervisorClient()
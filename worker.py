@@ -5,14 +5,18 @@ import glob
 import time
 import shutil
 import signal
-import random
 import asyncio
+import hashlib
+import threading
 import logging
 import argparse
 import subprocess
 from pathlib import Path
 from phrase import WORD_LIST
-from dotenv import load_dotenv
+from supervisor_client import supervisor, Fault
+from dotenv import load_dotenv, dotenv_values
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
 from concurrent.futures import ThreadPoolExecutor
 from logging.handlers import RotatingFileHandler
 
@@ -20,6 +24,29 @@ LOG_FILE = 'bot_manager.log'
 LOG_SIZE = 10 * 1024 * 1024  # 10 MB
 LOG_BACKUP_COUNT = 5
 SUPERVISORD_CONF_DIR = "/etc/supervisor/conf.d"
+SUPERVISOR_LOG_DIR = "/var/log/supervisor"
+# Size-based rotation; the dashboard compresses the backups into its log archive
+BOT_LOG_MAX_BYTES = os.getenv("BOT_LOG_MAX_BYTES", "10MB")
+BOT_LOG_BACKUPS = int(os.getenv("BOT_LOG_BACKUPS", 3))
+CONFIG_FILE = "config.json"
+ENV_FILE = "cluster.env"
+RECONCILE_DEBOUNCE = float(os.getenv("RECONCILE_DEBOUNCE", 2))
+CACHE_DIR = Path(os.getenv("BOT_CACHE_DIR", "/app/.cache"))
+VENV_CACHE_DIR = CACHE_DIR / "venvs"
+PIP_CACHE_DIR = CACHE_DIR / "pip"
+VENV_CACHE_MAX_BYTES = int(os.getenv("VENV_CACHE_MAX_MB", 4096)) * 1024 * 1024
+VENV_CACHE_MARKER = ".complete"
+VENV_INSTALL_TIMEOUT = int(os.getenv("VENV_INSTALL_TIMEOUT", 1800))
+MIRROR_CACHE_DIR = CACHE_DIR / "mirrors"
+GIT_MIRRORS = os.getenv("GIT_MIRRORS", "true").lower() in ("true", "1", "yes")
+MANIFEST_FILE = CACHE_DIR / "manifest.json"
+GIT_SYNC_MODE = os.getenv("GIT_SYNC_MODE", "incremental").lower()
+PIPELINE_STAGE_LIMITS = {
+    "fetch": int(os.getenv("PIPELINE_FETCH_CONCURRENCY", 4)),
+    "venv": int(os.getenv("PIPELINE_VENV_CONCURRENCY", 4)),
+    "install": int(os.getenv("PIPELINE_INSTALL_CONCURRENCY", 2)),
+    "config": int(os.getenv("PIPELINE_CONFIG_CONCURRENCY", 1)),
+}
 
 file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_SIZE, backupCount=LOG_BACKUP_COUNT)
 console_handler = logging.StreamHandler()
@@ -33,12 +60,16 @@ logging.getLogger().addHandler(file_handler)
 logging.getLogger().addHandler(console_handler)
 logging.getLogger().setLevel(logging.DEBUG)
 
-def generate_prefix():
-    word1 = random.choice(WORD_LIST)
-    word2 = random.choice(WORD_LIST)
-    prefix = f"{word1} {word2}"
-    logging.info(f'Generated prefix: {prefix}')
-    return prefix
+def stable_prefix(cluster_key):
+    """Pick two words from WORD_LIST deterministically, so a cluster keeps its name across restarts."""
+    digest = hashlib.sha256(cluster_key.encode()).digest()
+    word1 = WORD_LIST[int.from_bytes(digest[:4], 'big') % len(WORD_LIST)]
+    word2 = WORD_LIST[int.from_bytes(digest[4:8], 'big') % len(WORD_LIST)]
+    return f"{word1} {word2}"
+
+def dir_prefix(prefix):
+    """Start of the conf and checkout names of every bot in the cluster named with `prefix`."""
+    return prefix.replace(' ', '_') + '_'
 
 def get_pyenv_python(version):
     major_minor = '.'.join(version.split('.')[:2])
@@ -54,6 +85,223 @@ def run_with_pyenv(version, command_args, **kwargs):
     kwargs["env"] = env
     return subprocess.run(command_args, **kwargs)
     
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+_synced_mirrors = set()
+_venv_build_locks = {}
+_stage_semaphores = {}
+_manifest = {}
+
+def normalize_requirements(text):
+    lines = set()
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line:
+            lines.add(re.sub(r'\s+', '', line).lower())
+    return '\n'.join(sorted(lines))
+
+_INCLUDE_RE = re.compile(r'^(-r|--requirement|-c|--constraint)(?:\s+|=)?(\S+)$')
+_EDITABLE_RE = re.compile(r'^(-e|--editable)(?:\s+|=)?(\S+)$')
+_TREE_SKIP = {'.git', '__pycache__', 'venv', '.venv', 'build', 'dist'}
+
+def _tree_hash(path):
+    """Hash the files under a local package path, so edits to an editable install count."""
+    digest = hashlib.sha256()
+    if path.is_file():
+        digest.update(path.read_bytes())
+        return digest.hexdigest()
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in _TREE_SKIP and not d.endswith('.egg-info'))
+        for name in sorted(files):
+            file_path = Path(root) / name
+            digest.update(str(file_path.relative_to(path)).encode() + b'\0')
+            try:
+                digest.update(file_path.read_bytes())
+            except OSError:
+                pass
+    return digest.hexdigest()
+
+def expand_requirements(requirements_file, seen=None):
+    """Requirement lines with -r/-c files inlined and local -e paths replaced by a content hash."""
+    seen = set() if seen is None else seen
+    resolved = requirements_file.resolve()
+    if resolved in seen:
+        return []
+    seen.add(resolved)
+    lines = []
+    for line in requirements_file.read_text(errors='replace').splitlines():
+        line = line.split('#', 1)[0].strip()
+        include = _INCLUDE_RE.match(line)
+        editable = _EDITABLE_RE.match(line)
+        if include:
+            target = requirements_file.parent / include.group(2)
+            if not target.exists():
+                lines.append(line)
+                continue
+            included = expand_requirements(target, seen)
+            # Constraints only pin versions; keep them distinct from requirements
+            if include.group(1) in ('-c', '--constraint'):
+                included = [f"-c {item}" for item in included]
+            lines.extend(included)
+        elif editable and (requirements_file.parent / editable.group(2)).exists():
+            lines.append(f"-e {editable.group(2)}@{_tree_hash(requirements_file.parent / editable.group(2))}")
+        else:
+            lines.append(line)
+    return lines
+
+def requirements_hash(requirements_file):
+    if not requirements_file.exists():
+        return None
+    normalized = normalize_requirements('\n'.join(expand_requirements(requirements_file)))
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+def resolve_python_executable(version):
+    if version:
+        return get_pyenv_python(version)
+    return shutil.which("python3") or "python3"
+
+def get_interpreter_version(python_executable, version=None):
+    command = [python_executable, '-c', 'import sys; print(".".join(map(str, sys.version_info[:3])))']
+    try:
+        if version:
+            result = run_with_pyenv(version, command, capture_output=True, text=True, check=True)
+        else:
+            result = subprocess.run(command, capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (subprocess.CalledProcessError, OSError) as e:
+        logging.warning(f"Could not determine interpreter version for {python_executable}: {e}")
+        return version or "system"
+
+def venv_cache_key(interpreter_version, req_hash):
+    return f"py{interpreter_version}-{req_hash[:32]}"
+
+def _keyed_lock(*key):
+    with _key_locks_guard:
+        return _key_locks.setdefault(key, threading.Lock())
+
+def _dir_size(path):
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.lstat(os.path.join(root, f)).st_size
+            except OSError:
+                pass
+    return total
+
+def resolve_venv_key(cluster, requirements_file):
+    version = cluster.get("python_version")
+    python_executable = resolve_python_executable(version)
+    interpreter_version = get_interpreter_version(python_executable, version)
+    return venv_cache_key(interpreter_version, requirements_hash(requirements_file)), python_executable
+
+def _create_venv(cache_path, python_executable, version):
+    if cache_path.exists():
+        shutil.rmtree(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    venv_command = [python_executable, '-m', 'venv', str(cache_path)]
+    if version:
+        run_with_pyenv(version, venv_command, check=True)
+    else:
+        subprocess.run(venv_command, check=True)
+
+def _install_requirements(cache_path, version, requirements_file):
+    PIP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    pip_command = [str(cache_path / 'bin' / 'pip'), 'install', '--cache-dir', str(PIP_CACHE_DIR), '-r', str(requirements_file)]
+    if version:
+        run_with_pyenv(version, pip_command, check=True, timeout=VENV_INSTALL_TIMEOUT)
+    else:
+        subprocess.run(pip_command, check=True, timeout=VENV_INSTALL_TIMEOUT)
+    (cache_path / VENV_CACHE_MARKER).write_text(str(_dir_size(cache_path)))
+
+def _link_venv(cluster, venv_dir, cache_path):
+    if venv_dir.is_symlink() and Path(os.readlink(venv_dir)) == cache_path:
+        logging.info(f"Keeping existing venv for {cluster['bot_number']}, requirements unchanged.")
+        return
+    if venv_dir.is_symlink() or venv_dir.is_file():
+        venv_dir.unlink()
+    elif venv_dir.exists():
+        shutil.rmtree(venv_dir)
+    venv_dir.symlink_to(cache_path, target_is_directory=True)
+
+def evict_venv_cache(keep=(), max_bytes=VENV_CACHE_MAX_BYTES):
+    if not VENV_CACHE_DIR.exists():
+        return
+    entries = []
+    for entry in VENV_CACHE_DIR.iterdir():
+        marker = entry / VENV_CACHE_MARKER
+        if not marker.exists():
+            # Left behind by an interrupted build; a live build cannot be older than its install timeout
+            building = _venv_build_locks.get(entry.name)
+            if entry.name not in keep and not (building and building.locked()) \
+                    and time.time() - entry.stat().st_mtime > VENV_INSTALL_TIMEOUT:
+                logging.info(f"Removing incomplete venv cache entry {entry.name}")
+                shutil.rmtree(entry, ignore_errors=True)
+            continue
+        try:
+            size = int(marker.read_text().strip() or 0)
+        except ValueError:
+            size = _dir_size(entry)
+        entries.append((marker.stat().st_mtime, entry, size))
+
+    total = sum(size for _, _, size in entries)
+    for _, entry, size in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if entry.name in keep:
+            continue
+        logging.info(f"Evicting venv cache entry {entry.name} ({size // (1024 * 1024)} MB)")
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+
+def load_manifest():
+    try:
+        with open(MANIFEST_FILE, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, FileNotFoundError) as e:
+        logging.info(f"No usable provisioning manifest at {MANIFEST_FILE}: {e}")
+        return {}
+
+def save_manifest(manifest):
+    MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFEST_FILE.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_path, MANIFEST_FILE)
+
+def env_hash(env):
+    return hashlib.sha256(json.dumps(env or {}, sort_keys=True).encode()).hexdigest()
+
+def bot_fingerprint(cluster, commit, req_hash, venv_key):
+    return {
+        "git_url": cluster['git_url'],
+        "branch": cluster.get('branch', 'main'),
+        "commit": commit,
+        "requirements_hash": req_hash,
+        "python_version": cluster.get('python_version'),
+        "env_hash": env_hash(cluster.get('env')),
+        "run_command": cluster['run_command'],
+        "venv_key": venv_key,
+    }
+
+def is_checkout_warm(cluster, previous, commit, bot_dir):
+    """True when bot_dir already holds `commit` with the venv recorded in the manifest."""
+    if (previous.get('git_url'), previous.get('branch'), previous.get('python_version'), previous.get('commit')) != \
+            (cluster['git_url'], cluster.get('branch', 'main'), cluster.get('python_version'), commit):
+        return False
+    if _git_output(['rev-parse', 'HEAD'], bot_dir) != commit:
+        return False
+    if requirements_hash(bot_dir / 'requirements.txt') != previous.get('requirements_hash'):
+        return False
+    venv_key = previous.get('venv_key')
+    if venv_key:
+        cache_path = VENV_CACHE_DIR / venv_key
+        venv_dir = bot_dir / 'venv'
+        if not (cache_path / VENV_CACHE_MARKER).exists():
+            return False
+        if not venv_dir.is_symlink() or Path(os.readlink(venv_dir)) != cache_path:
+            return False
+    return True
+
 def validate_config(clusters):
     required_keys = ['bot_number', 'git_url', 'branch', 'run_command']
     seen_bot_suffixes = set()
@@ -64,7 +312,7 @@ def validate_config(clusters):
             logging.error(f"Missing required fields in: {cluster.get('name', 'Unknown')}")
             return False
 
-        if not cluster['git_url'].startswith('http'):
+        if not cluster['git_url'].startswith(('http', 'file://')):
             logging.error(f"Invalid git_url for {cluster['name']}.")
             return False
 
@@ -89,11 +337,12 @@ def load_config(file_path):
     try:
         with open(file_path, "r") as jsonfile:
             config = json.load(jsonfile)
-    except (json.JSONDecodeError, FileNotFoundError) as e:
-        logging.error(f"Error loading JSON file: {e}")
-        return []
+    except (json.JSONDecodeError, OSError) as e:
+        # A missing or half-written file is not an empty desired state
+        raise ValueError(f"Error loading JSON file: {e}") from e
 
     clusters = []
+    skipped = set()
     for cluster in config.get('clusters', []):
         details_str = os.getenv(cluster['name'], '{}')
         
@@ -101,14 +350,16 @@ def load_config(file_path):
             details = json.loads(details_str)
             if not isinstance(details, list) or len(details) < 4:
                 logging.warning(f"Skipping cluster {cluster['name']} due to missing details.")
+                skipped.add(cluster['name'])
                 continue
 
-            prefix = generate_prefix()
+            prefix = stable_prefix(cluster['name'])
             cluster_name = f"{prefix} {cluster['name']}"
             cron_value = details[6] if len(details) > 6 else cluster.get("cron", None)
 
             clusters.append({
                 "name": cluster_name,
+                "prefix": prefix,
                 "bot_number": f"{prefix} {details[0]}",
                 "git_url": details[1],
                 "branch": details[2],
@@ -119,15 +370,50 @@ def load_config(file_path):
 
         except json.JSONDecodeError:
             logging.error(f"Error decoding JSON for {cluster['name']}, skipping.")
+            skipped.add(cluster['name'])
             continue
 
     if not validate_config(clusters):
         raise ValueError("Invalid configuration file.")
+    if skipped and not clusters:
+        raise ValueError(f"None of the {len(skipped)} configured clusters could be loaded; is {ENV_FILE} missing or empty?")
 
+    skipped_clusters.clear()
+    skipped_clusters.update(skipped)
     return clusters
 
-load_dotenv('cluster.env', override=True)
-clusters = load_config("config.json")
+# Clusters present in config.json but left out of the last load, e.g. because their env var is missing
+skipped_clusters = set()
+
+def skipped_prefixes():
+    """Name prefixes of the bots and checkouts that belong to skipped clusters."""
+    return tuple(dir_prefix(stable_prefix(name)) for name in skipped_clusters)
+
+_base_env = dict(os.environ)
+load_dotenv(ENV_FILE, override=True)
+_dotenv_keys = set(dotenv_values(ENV_FILE))
+try:
+    clusters = load_config(CONFIG_FILE)
+    config_loaded = True
+except ValueError as e:
+    logging.error(f"Could not load the configuration: {e}")
+    clusters = []
+    config_loaded = False
+
+def reload_clusters():
+    """Re-read cluster.env and config.json, dropping variables that were removed from cluster.env."""
+    values = dotenv_values(ENV_FILE)
+    for key in _dotenv_keys - values.keys():
+        if key in _base_env:
+            os.environ[key] = _base_env[key]
+        else:
+            os.environ.pop(key, None)
+    for key, value in values.items():
+        if value is not None:
+            os.environ[key] = value
+    _dotenv_keys.clear()
+    _dotenv_keys.update(values)
+    return load_config(CONFIG_FILE)
 
 def write_supervisord_config(cluster, command):
     config_path = Path(SUPERVISORD_CONF_DIR) / f"{cluster['bot_number'].replace(' ', '_')}.conf"
@@ -141,121 +427,287 @@ def write_supervisord_config(cluster, command):
     autostart=true
     autorestart=true
     startretries=12
-    stderr_logfile=/var/log/supervisor/{cluster['bot_number'].replace(' ', '_')}_err.log
-    stdout_logfile=/var/log/supervisor/{cluster['bot_number'].replace(' ', '_')}_out.log
+    stderr_logfile={SUPERVISOR_LOG_DIR}/{cluster['bot_number'].replace(' ', '_')}_err.log
+    stdout_logfile={SUPERVISOR_LOG_DIR}/{cluster['bot_number'].replace(' ', '_')}_out.log
+    stdout_logfile_maxbytes={BOT_LOG_MAX_BYTES}
+    stdout_logfile_backups={BOT_LOG_BACKUPS}
+    stderr_logfile_maxbytes={BOT_LOG_MAX_BYTES}
+    stderr_logfile_backups={BOT_LOG_BACKUPS}
     {f"environment={env_vars}" if env_vars else ""}
     """
-    config_path.write_text(config_content.strip())
+    config_content = config_content.strip()
+    if config_path.exists() and config_path.read_text() == config_content:
+        logging.info(f"Supervisord configuration for {cluster['bot_number']} is unchanged.")
+        return False
+    config_path.write_text(config_content)
     logging.info(f"Supervisord configuration for {cluster['bot_number']} written successfully.")
+    return True
 
-def _prepare_bot_dir(cluster):
-    bot_dir = Path('/app') / cluster['bot_number'].replace(" ", "_")
-    venv_dir = bot_dir / 'venv'
-    requirements_file = bot_dir / 'requirements.txt'
+def _git_output(args, cwd=None):
+    result = subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def resolve_branch_commit(cluster):
+    """Return the commit the configured branch currently points at upstream."""
     branch = cluster.get('branch', 'main')
-    
+    if GIT_MIRRORS:
+        return _git_output(['rev-parse', f'refs/heads/{branch}'], sync_mirror(cluster['git_url']))
+    output = _git_output(['ls-remote', cluster['git_url'], f'refs/heads/{branch}'])
+    return output.split()[0] if output else None
+
+def mirror_path(git_url):
+    return MIRROR_CACHE_DIR / f"{hashlib.sha256(git_url.encode()).hexdigest()[:16]}.git"
+
+def sync_mirror(git_url):
+    """Fetch the shared bare mirror for git_url once per provisioning pass and return its path."""
+    path = mirror_path(git_url)
+    with _keyed_lock('mirror', git_url):
+        if git_url in _synced_mirrors and (path / 'HEAD').exists():
+            return path
+        if (path / 'HEAD').exists():
+            logging.info(f'Fetching mirror {path.name}')
+            subprocess.run(['git', 'fetch', '--prune', 'origin'], cwd=path, check=True)
+        else:
+            logging.info(f'Creating mirror {path.name}')
+            MIRROR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            try:
+                subprocess.run(['git', 'clone', '--mirror', git_url, str(path)], check=True)
+                # Checkouts borrow objects from the mirror, so it must never prune them.
+                subprocess.run(['git', 'config', 'gc.auto', '0'], cwd=path, check=True)
+            except Exception:
+                shutil.rmtree(path, ignore_errors=True)
+                raise
+        _synced_mirrors.add(git_url)
+    return path
+
+def _uses_mirror(bot_dir, mirror):
+    alternates = bot_dir / '.git' / 'objects' / 'info' / 'alternates'
+    return alternates.exists() and str(mirror / 'objects') in alternates.read_text()
+
+def _clone_bot_repo(cluster, bot_dir, branch, mirror=None):
     if bot_dir.exists():
         logging.info(f'Removing existing directory: {bot_dir}')
         shutil.rmtree(bot_dir)
-    
-    logging.info(f'Cloning {cluster["bot_number"]} from {cluster["git_url"]} (branch: {branch})')
-    subprocess.run(['git', 'clone', '-b', branch, '--single-branch', cluster['git_url'], str(bot_dir)], check=True)
-    version = cluster.get("python_version")
-    if version:
-        python_executable = get_pyenv_python(version)
+    if mirror:
+        logging.info(f'Checking out {cluster["bot_number"]} from mirror {mirror.name} (branch: {branch})')
+        subprocess.run(['git', 'clone', '--shared', '-b', branch, '--single-branch', str(mirror), str(bot_dir)], check=True)
+        subprocess.run(['git', 'remote', 'set-url', 'origin', cluster['git_url']], cwd=bot_dir, check=True)
     else:
-        python_executable = shutil.which("python3") or "python3"
-        
-    if requirements_file.exists():
-        logging.info(f'Creating virtual environment for {cluster["bot_number"]} using {python_executable}')
-        if version:
-            run_with_pyenv(version, [python_executable, '-m', 'venv', str(venv_dir)], check=True)
-            pip_command = [str(venv_dir / 'bin' / 'pip'), 'install', '--no-cache-dir', '-r', str(requirements_file)]
-            run_with_pyenv(version, pip_command, check=True)
+        logging.info(f'Cloning {cluster["bot_number"]} from {cluster["git_url"]} (branch: {branch})')
+        subprocess.run(['git', 'clone', '--depth', '1', '-b', branch, '--single-branch', cluster['git_url'], str(bot_dir)], check=True)
+
+def _update_bot_repo(cluster, bot_dir, branch, mirror=None):
+    if mirror:
+        logging.info(f'Updating {cluster["bot_number"]} from mirror {mirror.name} (branch: {branch})')
+        subprocess.run(['git', 'fetch', str(mirror), branch], cwd=bot_dir, check=True)
+    else:
+        logging.info(f'Fetching {cluster["bot_number"]} from {cluster["git_url"]} (branch: {branch})')
+        subprocess.run(['git', 'fetch', '--depth', '1', 'origin', branch], cwd=bot_dir, check=True)
+    subprocess.run(['git', 'reset', '--hard', 'FETCH_HEAD'], cwd=bot_dir, check=True)
+    subprocess.run(['git', 'clean', '-ffdx', '-e', '/venv'], cwd=bot_dir, check=True)
+
+def sync_bot_repo(cluster, bot_dir):
+    """Bring bot_dir to the branch tip, reusing an existing checkout of the same remote when possible."""
+    branch = cluster.get('branch', 'main')
+    mirror = sync_mirror(cluster['git_url']) if GIT_MIRRORS else None
+    if GIT_SYNC_MODE == "incremental" and (bot_dir / '.git').exists():
+        remote_url = _git_output(['remote', 'get-url', 'origin'], bot_dir)
+        if remote_url != cluster['git_url']:
+            logging.info(f'Remote for {cluster["bot_number"]} changed, recloning.')
+        elif mirror and not _uses_mirror(bot_dir, mirror):
+            logging.info(f'Checkout for {cluster["bot_number"]} does not share the mirror, recloning.')
+        elif _git_output(['symbolic-ref', '--short', 'HEAD'], bot_dir) != branch:
+            # A single-branch checkout cannot track another branch; resetting it would leave
+            # HEAD on the old branch and upstream, which `git pull` would then merge into.
+            logging.info(f'Branch for {cluster["bot_number"]} changed to {branch}, recloning.')
         else:
-             subprocess.run([python_executable, '-m', 'venv', str(venv_dir)], check=True)
-             pip_command = [str(venv_dir / 'bin' / 'pip'), 'install', '--no-cache-dir', '-r', str(requirements_file)]
-             subprocess.run(pip_command, check=True)
-                
-async def start_bot(cluster):
-    logging.info(f'Starting bot: {cluster["bot_number"]}')
+            try:
+                _update_bot_repo(cluster, bot_dir, branch, mirror)
+                return
+            except subprocess.CalledProcessError as e:
+                logging.warning(f'Incremental sync failed for {cluster["bot_number"]}, falling back to a fresh clone: {e}')
+    _clone_bot_repo(cluster, bot_dir, branch, mirror)
+
+def _is_bot_dir(path):
+    return path.is_dir() and not path.is_symlink() and (path / '.git').exists() \
+        and re.search(r'bot\d+$', path.name) is not None
+
+def migrate_bot_dirs(clusters):
+    """Rename checkouts left behind under old random names and remove those of removed clusters.
+
+    Checkouts that may belong to a skipped cluster (still configured, but not loadable right
+    now) are kept.
+    """
+    app_dir = Path('/app')
+    if not app_dir.exists():
+        return
+    wanted = {cluster['bot_number'].replace(' ', '_'): cluster for cluster in clusters}
+    loaded_prefixes = tuple(dir_prefix(cluster['prefix']) for cluster in clusters)
+    leftovers = [path for path in app_dir.iterdir() if _is_bot_dir(path) and path.name not in wanted]
+
+    for bot_conf_name, cluster in wanted.items():
+        if (app_dir / bot_conf_name).exists():
+            continue
+        suffix = '_' + cluster['bot_number'].split(' ')[-1]
+        for old_dir in leftovers:
+            if old_dir.name.endswith(suffix) and _git_output(['remote', 'get-url', 'origin'], old_dir) == cluster['git_url']:
+                logging.info(f"Migrating {old_dir.name} to {bot_conf_name}")
+                old_dir.rename(app_dir / bot_conf_name)
+                for stream in ('out', 'err'):
+                    old_log = Path(SUPERVISOR_LOG_DIR) / f"{old_dir.name}_{stream}.log"
+                    new_log = Path(SUPERVISOR_LOG_DIR) / f"{bot_conf_name}_{stream}.log"
+                    if old_log.exists() and not new_log.exists():
+                        old_log.rename(new_log)
+                if old_dir.name in _manifest:
+                    _manifest[bot_conf_name] = _manifest.pop(old_dir.name)
+                leftovers.remove(old_dir)
+                break
+
+    for old_dir in leftovers:
+        if old_dir.name.startswith(skipped_prefixes()):
+            logging.info(f"Keeping {old_dir.name}: its cluster is configured but skipped")
+            continue
+        if skipped_clusters and not old_dir.name.startswith(loaded_prefixes):
+            # An old random-named checkout could belong to a skipped cluster; decide once it loads
+            logging.info(f"Keeping unclaimed {old_dir.name} while {len(skipped_clusters)} cluster(s) are skipped")
+            continue
+        logging.info(f"Removing orphaned bot directory {old_dir}")
+        shutil.rmtree(old_dir, ignore_errors=True)
+        _manifest.pop(old_dir.name, None)
+
+async def run_stage(stage, func, *args):
+    """Run a blocking provisioning step in the executor, bounded by the stage's concurrency limit."""
+    semaphore = _stage_semaphores.get(stage)
+    if semaphore is None:
+        semaphore = _stage_semaphores[stage] = asyncio.Semaphore(max(1, PIPELINE_STAGE_LIMITS[stage]))
+    async with semaphore:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+async def provision_venv(cluster, venv_dir, requirements_file):
+    """Link venv_dir to the shared venv for this bot's requirements, building it on a cache miss."""
+    version = cluster.get("python_version")
+    key, python_executable = await run_stage("venv", resolve_venv_key, cluster, requirements_file)
+    cache_path = VENV_CACHE_DIR / key
+    marker = cache_path / VENV_CACHE_MARKER
+
+    async with _venv_build_locks.setdefault(key, asyncio.Lock()):
+        if marker.exists():
+            logging.info(f"Venv cache hit for {cluster['bot_number']}: {key}")
+        else:
+            logging.info(f"Venv cache miss for {cluster['bot_number']}: {key}, building with {python_executable}")
+            try:
+                await run_stage("venv", _create_venv, cache_path, python_executable, version)
+                await run_stage("install", _install_requirements, cache_path, version, requirements_file)
+            except Exception:
+                shutil.rmtree(cache_path, ignore_errors=True)
+                raise
+        os.utime(marker)
+
+    _link_venv(cluster, venv_dir, cache_path)
+    return key
+
+def build_run_command(cluster):
     bot_dir = Path('/app') / cluster['bot_number'].replace(" ", "_")
     venv_dir = bot_dir / 'venv'
     bot_file = bot_dir / cluster['run_command']
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, _prepare_bot_dir, cluster)
 
     python_executable = venv_dir / 'bin' / 'python3'
     if cluster.get('python_version'):
         python_executable = venv_dir / 'bin' / f'python{cluster["python_version"]}'
 
     if bot_file.suffix == ".sh":
-        command = f"bash {bot_file}"
+        return f"bash {bot_file}"
     elif bot_file.suffix == ".py":
-        command = f"{python_executable} {bot_file}"
-    else:
-        command = f"{python_executable} -m {bot_file.stem}"
-
-    write_supervisord_config(cluster, command)
-
-async def async_supervisorctl(command):
-    proc = await asyncio.create_subprocess_shell(
-        command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await proc.communicate()
-    if proc.returncode != 0:
-        logging.error(f"Supervisorctl command failed: {stderr.decode()}")
+        return f"{python_executable} {bot_file}"
+    return f"{python_executable} -m {bot_file.stem}"
+
+async def register_bot(cluster, restart=False):
+    bot_conf_name = cluster['bot_number'].replace(' ', '_')
+    await supervisor_call(supervisor.update, [bot_conf_name])
+    if restart:
+        await supervisor_call(supervisor.multicall, [
+            ("supervisor.stopProcess", (bot_conf_name, True)),
+            ("supervisor.startProcess", (bot_conf_name, True)),
+        ])
+
+async def start_bot(cluster):
+    logging.info(f'Starting bot: {cluster["bot_number"]}')
+    started = time.monotonic()
+    bot_conf_name = cluster['bot_number'].replace(" ", "_")
+    bot_dir = Path('/app') / bot_conf_name
+    venv_dir = bot_dir / 'venv'
+    requirements_file = bot_dir / 'requirements.txt'
+    config_path = Path(SUPERVISORD_CONF_DIR) / f"{bot_conf_name}.conf"
+
+    commit = await run_stage("fetch", resolve_branch_commit, cluster)
+    previous = _manifest.get(bot_conf_name)
+    warm = bool(commit and previous) and is_checkout_warm(cluster, previous, commit, bot_dir)
+
+    if warm and config_path.exists() and previous.get('env_hash') == env_hash(cluster.get('env')) \
+            and previous.get('run_command') == cluster['run_command']:
+        logging.info(f'Bot {cluster["bot_number"]} unchanged at {commit[:7]}, skipping provisioning')
+        await register_bot(cluster)
+        return previous.get('venv_key')
+
+    if warm:
+        logging.info(f'Bot {cluster["bot_number"]} code unchanged at {commit[:7]}, rewriting supervisord config only')
+        venv_key = previous.get('venv_key')
     else:
-        logging.info(f"Supervisorctl command succeeded: {stdout.decode()}")
+        await run_stage("fetch", sync_bot_repo, cluster, bot_dir)
+        commit = await run_stage("fetch", _git_output, ['rev-parse', 'HEAD'], bot_dir)
+        venv_key = None
+        if requirements_file.exists():
+            venv_key = await provision_venv(cluster, venv_dir, requirements_file)
+
+    changed = await run_stage("config", write_supervisord_config, cluster, build_run_command(cluster))
+    await register_bot(cluster, restart=not changed)
+
+    _manifest[bot_conf_name] = bot_fingerprint(cluster, commit, requirements_hash(requirements_file), venv_key)
+    save_manifest(_manifest)
+    logging.info(f'Bot {cluster["bot_number"]} provisioned in {time.monotonic() - started:.1f}s')
+    return venv_key
+
+async def supervisor_call(func, *args):
+    loop = asyncio.get_event_loop()
+    try:
+        result = await loop.run_in_executor(None, func, *args)
+        logging.info(f"Supervisor {func.__name__} succeeded: {result}")
+        return result
+    except (Fault, OSError) as e:
+        logging.error(f"Supervisor {func.__name__} failed: {e}")
+        return None
 
 async def reload_supervisord():
     logging.info("Reloading supervisord...")
-    await async_supervisorctl("supervisorctl reread")
-    await async_supervisorctl("supervisorctl update")
+    await supervisor_call(supervisor.update)
     logging.info("Supervisord updated successfully.")
 
 async def get_process_status(bot_conf_name):
-    proc = await asyncio.create_subprocess_shell(
-        f"supervisorctl status {bot_conf_name}",
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await proc.communicate()
-    if proc.returncode == 0:
-        status_line = stdout.decode().strip()
-        if status_line:
-            parts = status_line.split()
-            if len(parts) >= 2:
-                return parts[1]
-    return None
-
-async def cleanup_existing_bots():
+    info = await supervisor_call(supervisor.get_process_info, bot_conf_name)
+    return info['statename'] if info else None
+
+async def cleanup_existing_bots(keep=(), keep_prefixes=()):
     conf_dir = Path(SUPERVISORD_CONF_DIR)
-    for conf_file in conf_dir.glob("*.conf"):
-        bot_conf_name = conf_file.stem
-        await async_supervisorctl(f"supervisorctl stop {bot_conf_name}")
+    stale = [conf_file for conf_file in conf_dir.glob("*.conf")
+             if conf_file.stem not in keep and not conf_file.stem.startswith(keep_prefixes)]
+    if not stale:
+        return
+    await supervisor_call(supervisor.stop_processes, [conf_file.stem for conf_file in stale])
+    for conf_file in stale:
         conf_file.unlink()
-        logging.info(f"Cleaned up supervisord config and stopped bot: {bot_conf_name}")
+        _manifest.pop(conf_file.stem, None)
+        logging.info(f"Cleaned up supervisord config and stopped bot: {conf_file.stem}")
     await reload_supervisord()
 
-async def wait_for_process_stop(bot_conf_name, timeout=30, interval=2):
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        status = await get_process_status(bot_conf_name)
-        if status != 'RUNNING':
-            return True
-        await asyncio.sleep(interval)
-    return False
-
 async def stop_bot(bot_number):
     logging.info(f"Stopping bot: {bot_number}")
     bot_conf_name = bot_number.replace(" ", "_")
-    
-    await async_supervisorctl(f"supervisorctl stop {bot_conf_name}")
-    if not await wait_for_process_stop(bot_conf_name):
-        logging.warning(f"Process {bot_conf_name} did not stop within timeout.")
+
+    # stopProcess with wait=True returns once supervisord has seen the process exit.
+    if await supervisor_call(supervisor.stop_process, bot_conf_name) is None \
+            and await get_process_status(bot_conf_name) == 'RUNNING':
+        logging.warning(f"Process {bot_conf_name} did not stop.")
     
     conf_path = Path(SUPERVISORD_CONF_DIR) / f"{bot_conf_name}.conf"
     if conf_path.exists():
@@ -263,9 +715,106 @@ async def stop_bot(bot_number):
         logging.info(f"Removed supervisord configuration for {bot_number}.")
 
 async def sort_bot_run_commands(clusters):
+    _synced_mirrors.clear()
     tasks = [start_bot(cluster) for cluster in clusters]
-    await asyncio.gather(*tasks)
-    await reload_supervisord()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for cluster, result in zip(clusters, results):
+        if isinstance(result, Exception):
+            logging.error(f"Failed to provision {cluster['bot_number']}: {result}")
+    in_use = {entry.get('venv_key') for entry in _manifest.values()}
+    evict_venv_cache(keep=in_use | {key for key in results if isinstance(key, str)})
+    return results
+
+async def reconcile(applied):
+    """Converge supervisord on the current config, touching only bots whose definition changed."""
+    started = time.monotonic()
+    try:
+        desired_clusters = reload_clusters()
+    except ValueError as e:
+        logging.error(f"Not reconciling, configuration could not be loaded: {e}")
+        return
+
+    desired = {cluster['bot_number'].replace(' ', '_'): cluster for cluster in desired_clusters}
+    # Bots of clusters that are configured but skipped right now keep running
+    removed = [name for name in applied if name not in desired and not name.startswith(skipped_prefixes())]
+    changed = [cluster for name, cluster in desired.items() if applied.get(name) != cluster]
+    clusters[:] = desired_clusters
+    if not removed and not changed:
+        logging.info("Reconcile: configuration unchanged.")
+        return
+
+    for name in removed:
+        await stop_bot(name)
+        applied.pop(name, None)
+        _manifest.pop(name, None)
+    if removed:
+        await reload_supervisord()
+
+    if changed:
+        results = await sort_bot_run_commands(changed)
+        for cluster, result in zip(changed, results):
+            if not isinstance(result, Exception):
+                applied[cluster['bot_number'].replace(' ', '_')] = cluster
+
+    save_manifest(_manifest)
+    logging.info(f"Reconciled {len(changed)} changed and {len(removed)} removed bot(s) in {time.monotonic() - started:.1f}s")
+
+class ConfigChangeHandler(FileSystemEventHandler):
+    # Reading the files during a reconcile raises open/close events; only writes count.
+    WRITE_EVENTS = {'created', 'modified', 'moved', 'deleted'}
+
+    def __init__(self, loop, event, filenames):
+        self.loop = loop
+        self.event = event
+        self.filenames = filenames
+
+    def on_any_event(self, event):
+        if event.event_type not in self.WRITE_EVENTS:
+            return
+        paths = (event.src_path, getattr(event, 'dest_path', None))
+        if any(path and Path(path).name in self.filenames for path in paths):
+            self.loop.call_soon_threadsafe(self.event.set)
+
+async def _wait_any(*events):
+    waiters = [asyncio.ensure_future(event.wait()) for event in events]
+    await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    for waiter in waiters:
+        waiter.cancel()
+
+async def run_daemon(applied):
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    watch_dirs = {str(Path(path).resolve().parent) for path in (CONFIG_FILE, ENV_FILE)}
+    handler = ConfigChangeHandler(loop, changed, {Path(CONFIG_FILE).name, Path(ENV_FILE).name})
+    observer = Observer()
+    for watch_dir in watch_dirs:
+        observer.schedule(handler, watch_dir, recursive=False)
+    observer.start()
+    logging.info(f"Reconciler watching {CONFIG_FILE} and {ENV_FILE}")
+
+    try:
+        while not stopping.is_set():
+            await _wait_any(changed, stopping)
+            if stopping.is_set():
+                break
+            # Editors and deploy tools write in bursts; wait for the files to settle.
+            while True:
+                changed.clear()
+                try:
+                    await asyncio.wait_for(changed.wait(), RECONCILE_DEBOUNCE)
+                except asyncio.TimeoutError:
+                    break
+            await reconcile(applied)
+    finally:
+        observer.stop()
+        observer.join()
+
+    logging.info('Shutting down...')
+    await restart_all_bots()
 
 async def restart_all_bots():
     logging.info('Stopping all bots...')
@@ -284,16 +833,32 @@ signal.signal(signal.SIGTERM, signal_handler)
 async def main_async():
     parser = argparse.ArgumentParser(description='Bot Manager')
     parser.add_argument('--restart', action='store_true', help='Restart all bots')
+    parser.add_argument('--daemon', action='store_true', help='Keep running and reconcile bots when config.json or cluster.env change')
     args = parser.parse_args()
-    await cleanup_existing_bots()
+    _manifest.update(load_manifest())
 
     if args.restart:
+        await cleanup_existing_bots()
         logging.info('Restarting bot manager...')
-        await asyncio.gather(*(async_supervisorctl(f"supervisorctl stop {cluster['bot_number'].replace(' ', '_')}") for cluster in clusters))
+        await supervisor_call(supervisor.stop_processes, [cluster['bot_number'].replace(' ', '_') for cluster in clusters])
         await reload_supervisord()
+    elif not config_loaded:
+        # Leave the running bots alone; the daemon reconciles once the config loads again
+        logging.error('Starting bot manager without a usable configuration, not touching existing bots.')
+        if args.daemon:
+            await run_daemon({})
     else:
         logging.info('Starting bot manager...')
-        await sort_bot_run_commands(clusters)
+        # Migrate first: cleanup drops the manifest entries of the old names migration carries over
+        migrate_bot_dirs(clusters)
+        await cleanup_existing_bots(keep={cluster['bot_number'].replace(' ', '_') for cluster in clusters},
+                                    keep_prefixes=skipped_prefixes())
+        results = await sort_bot_run_commands(clusters)
+        save_manifest(_manifest)
+        if args.daemon:
+            applied = {cluster['bot_number'].replace(' ', '_'): cluster
+                       for cluster, result in zip(clusters, results) if not isinstance(result, Exception)}
+            await run_daemon(applied)
 
 if __name__ == "__main__":
     asyncio.run(main_async())